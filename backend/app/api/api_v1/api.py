@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
-from app.api.api_v1.endpoints import auth, users, projects, segments, folders, languages, upload
+from app.api.api_v1.endpoints import auth, users, projects, segments, folders, languages, upload, storage, metrics, audio
+from app.core.principals import Principal
 from app.core.deps import get_current_user
-from app.models.user import User as UserModel
 
 api_router = APIRouter()
 
@@ -12,10 +12,13 @@ api_router.include_router(segments.router, prefix="/segments", tags=["segments"]
 api_router.include_router(folders.router, prefix="/folders", tags=["folders"])
 api_router.include_router(languages.router, prefix="/languages", tags=["languages"])
 api_router.include_router(upload.router, prefix="", tags=["upload"])
+api_router.include_router(storage.router, prefix="/storage", tags=["storage"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+api_router.include_router(audio.router, prefix="/audio", tags=["audio"])
 
 
 @api_router.get("/test-auth")
-def test_auth(current_user: UserModel = Depends(get_current_user)):
+def test_auth(current_user: Principal = Depends(get_current_user)):
     return {
         "isAuthenticated": True,
         "user": {
@@ -0,0 +1,43 @@
+import os
+import re
+import time
+from fastapi import APIRouter, HTTPException, Request, status
+from app.core.security import verify_audio_signature
+from app.services.audio_service import audio_response, get_file_identity, parse_window
+from app.services.storage_service import blob_path
+from app.constants import ErrorMessages
+
+router = APIRouter()
+
+BLOB_FILE_NAME = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,8})?$")
+
+@router.api_route("/{file_name}", methods=["GET", "HEAD"])
+def get_signed_audio(
+    file_name: str,
+    request: Request,
+    expires: int,
+    signature: str,
+    window: str = ""
+):
+    """Stream a blob behind a signed link; no token or database lookup is involved"""
+    if not BLOB_FILE_NAME.match(file_name) or not verify_audio_signature(file_name, expires, window, signature):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=ErrorMessages.INVALID_AUDIO_SIGNATURE
+        )
+    
+    digest = os.path.splitext(file_name)[0]
+    file_path = blob_path(digest, file_name)
+    identity = get_file_identity(file_path, digest)
+    if identity is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorMessages.AUDIO_FILE_NOT_FOUND
+        )
+    
+    # The link is a bearer capability, so shared caches must not keep it
+    max_age = max(int(expires - time.time()), 0)
+    return audio_response(
+        request, file_path, identity, parse_window(window), file_name,
+        cache_control=f"private, max-age={max_age}"
+    )
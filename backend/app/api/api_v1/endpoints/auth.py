@@ -3,11 +3,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import verify_token
+from app.core.passwords import PasswordHasherBusy
 from app.services.auth_service import AuthService
 from app.services.user_service import get_user_with_languages_service
 from app.schemas.auth import LoginRequest
 from app.schemas.response import AuthResponse, TokenVerificationResponse, MessageResponse, UserResponse
-from app.models.user import User as UserModel
+from app.core.principals import Principal
 from app.core.deps import get_current_user
 from app.constants import ErrorMessages
 
@@ -16,10 +17,16 @@ security = HTTPBearer()
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     try:
         auth_service = AuthService(db)
-        return auth_service.login(login_data.username, login_data.password)
+        return await auth_service.login(login_data.username, login_data.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorMessages.LOGIN_BUSY,
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,7 +76,7 @@ def change_password(
 
 @router.get("/user", response_model=UserResponse)
 def get_current_user_info(
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -1,23 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
+from app.core.config import settings
+from app.core.principals import Principal
 from app.core.deps import get_current_user
+from app.core.serialization import json_response
 from app.services.folder_service import (
     get_folder_by_id_service, get_project_folders_service,
     create_folder_service, update_folder_service, delete_folder_service
 )
+from app.services.upload_service import upload_folder_segments_service
+from app.services.bundle_service import get_folder_bundle_service
+from app.services.export_service import export_folder_service
 from app.schemas.folder import FolderCreate, FolderUpdate
 from app.schemas.response import FolderResponse, MessageResponse
-from app.models.user import User as UserModel
 from app.constants import ErrorMessages
 
 router = APIRouter()
 
+FOLDER_UPLOAD_ERROR_STATUS = {
+    ErrorMessages.FOLDER_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorMessages.PROJECT_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorMessages.NO_PERMISSION_FOLDER: status.HTTP_403_FORBIDDEN,
+}
+
+def folder_upload_error(e: ValueError) -> HTTPException:
+    """A missing or hidden folder is not a bad upload; anything else is the files' fault"""
+    return HTTPException(
+        status_code=FOLDER_UPLOAD_ERROR_STATUS.get(str(e), status.HTTP_400_BAD_REQUEST),
+        detail=str(e)
+    )
+
 @router.get("/{folder_id}", response_model=FolderResponse)
 def get_folder_by_id(
     folder_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -28,25 +47,70 @@ def get_folder_by_id(
             detail=str(e)
         )
 
+@router.get("/{folder_id}/bundle")
+def get_folder_bundle(
+    folder_id: int,
+    segment_id: int = Query(..., alias="segmentId"),
+    count: int = Query(5, ge=1, le=settings.BUNDLE_MAX_SEGMENTS),
+    bundle_format: str = Query("multipart", alias="format", pattern="^(multipart|zip)$"),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream metadata and audio of ``count`` segments from ``segmentId`` on, in segment order"""
+    try:
+        media_type, body = get_folder_bundle_service(
+            db, folder_id, segment_id, count, bundle_format, current_user
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return StreamingResponse(body, media_type=media_type, headers={"Cache-Control": "private, no-store"})
+
+@router.get("/{folder_id}/export")
+def export_folder(
+    folder_id: int,
+    export_format: str = Query(..., alias="format", pattern="^(srt|vtt|csv|ndjson|txt)$"),
+    text: str = Query("transcription", pattern="^(transcription|translation|both)$"),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the folder's segments as SRT, WebVTT, CSV, NDJSON or plain text; ``text`` picks the cue text of srt, vtt and txt"""
+    try:
+        media_type, filename, body = export_folder_service(db, folder_id, current_user, export_format, text)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return StreamingResponse(
+        body, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "private, no-store"}
+    )
+
 @router.get("/project/{project_id}", response_model=List[FolderResponse])
 def get_project_folders(
     project_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    fields: Optional[str] = Query(None, max_length=1000),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """A project's folders; ``fields`` is a comma-separated list of response fields to return instead of all of them"""
     try:
-        return get_project_folders_service(db, project_id, current_user)
+        body = get_project_folders_service(db, project_id, current_user, fields)
     except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
+            status_code=status.HTTP_400_BAD_REQUEST if str(e).startswith(ErrorMessages.UNKNOWN_FIELDS) else status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    return json_response(body)
 
 @router.post("/project/{project_id}", response_model=FolderResponse)
 def create_folder_endpoint(
     project_id: int,
     folder_data: FolderCreate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -61,7 +125,7 @@ def create_folder_endpoint(
 def update_folder_endpoint(
     folder_id: int,
     folder_update: FolderUpdate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -75,7 +139,7 @@ def update_folder_endpoint(
 @router.delete("/{folder_id}", response_model=MessageResponse)
 def delete_folder_endpoint(
     folder_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -84,4 +148,16 @@ def delete_folder_endpoint(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+@router.post("/{folder_id}/upload-segments", response_model=MessageResponse)
+def upload_folder_segments(
+    folder_id: int,
+    audio_files: List[UploadFile] = File(..., alias="audioFiles"),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        return upload_folder_segments_service(db, folder_id, audio_files, current_user)
+    except ValueError as e:
+        raise folder_upload_error(e)
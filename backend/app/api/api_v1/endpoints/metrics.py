@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from app.core.principals import Principal
+from app.core.deps import get_current_manager_user
+from app.core.metrics import collect_metrics
+
+router = APIRouter()
+
+@router.get("/", response_model=dict)
+def get_metrics(
+    current_user: Principal = Depends(get_current_manager_user)
+):
+    return collect_metrics()
@@ -1,36 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.principals import Principal
 from app.core.deps import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import json_response
 from app.services.project_service import (
     get_user_projects, get_project_by_id_service, update_project_service,
     recalculate_project_stats_service, delete_project_service
 )
+from app.services.export_service import export_project_service
 from app.schemas.project import ProjectUpdate
 from app.schemas.response import ProjectResponse, MessageResponse
-from app.models.user import User as UserModel
 from app.constants import ErrorMessages
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ProjectResponse])
 def get_all_projects(
-    current_user: UserModel = Depends(get_current_user),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.PROJECT_PAGE_MAX_SIZE),
+    project_status: Optional[str] = Query(None, alias="status"),
+    language_id: Optional[int] = Query(None, alias="languageId"),
+    user_id: Optional[str] = Query(None, alias="userId"),
+    domain_type: Optional[str] = Query(None, alias="domainType"),
+    name_prefix: Optional[str] = Query(None, alias="name", min_length=1, max_length=200),
+    sort: str = Query("-createdAt", pattern="^-?(createdAt|updatedAt|name)$"),
+    fields: Optional[str] = Query(None, max_length=1000),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """Projects in ``sort`` order; with ``limit`` or ``cursor`` one page, the next page's cursor in X-Next-Cursor.
+    ``fields`` is a comma-separated list of response fields to return instead of all of them."""
+    filters = {
+        "status": project_status,
+        "language_id": language_id,
+        "user_id": user_id,
+        "domain_type": domain_type,
+    }
     try:
-        return get_user_projects(db, current_user)
+        body, next_page = get_user_projects(
+            db, current_user, cursor, limit, filters, name_prefix, sort, fields
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    return json_response(body, {NEXT_CURSOR_HEADER: next_page} if next_page else None)
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 def get_project_by_id(
     project_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -41,11 +66,32 @@ def get_project_by_id(
             detail=str(e)
         )
 
+@router.get("/{project_id}/export")
+def export_project(
+    project_id: int,
+    export_format: str = Query(..., alias="format", pattern="^(srt|vtt|csv|ndjson|txt)$"),
+    text: str = Query("transcription", pattern="^(transcription|translation|both)$"),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the project's segments as SRT, WebVTT, CSV, NDJSON or plain text; ``text`` picks the cue text of srt, vtt and txt"""
+    try:
+        media_type, filename, body = export_project_service(db, project_id, current_user, export_format, text)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return StreamingResponse(
+        body, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "private, no-store"}
+    )
+
 @router.patch("/{project_id}", response_model=ProjectResponse)
 def update_project_endpoint(
     project_id: int,
     project_update: ProjectUpdate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -59,7 +105,7 @@ def update_project_endpoint(
 @router.post("/{project_id}/recalculate-stats", response_model=ProjectResponse)
 def recalculate_project_stats_endpoint(
     project_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -73,7 +119,7 @@ def recalculate_project_stats_endpoint(
 @router.delete("/{project_id}", response_model=MessageResponse)
 def delete_project_endpoint(
     project_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -1,30 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-import os
+from typing import List, Optional
 from app.core.database import get_db
+from app.core.config import settings
+from app.core.principals import Principal
 from app.core.deps import get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import json_response
+from app.core.conditional import content_etag, is_not_modified, not_modified_response
+from app.services.audio_service import get_file_identity, segment_audio_response
 from app.services.segment_service import (
     get_segment_by_id_service, update_segment_service,
     get_project_segments_service, get_folder_segments_service,
-    delete_segment_service
+    delete_segment_service, get_segment_peaks_service
 )
 from app.crud.segment import get_segment
 from app.schemas.segment import SegmentUpdate
-from app.schemas.response import SegmentResponse, MessageResponse
-from app.models.user import User as UserModel
+from app.schemas.response import SegmentResponse, MessageResponse, PeaksResponse
 from app.constants import ErrorMessages
 
 router = APIRouter()
 
+def list_error(e: ValueError) -> HTTPException:
+    """Malformed cursors and unknown fields are the client's fault; anything else is a missing or hidden list"""
+    message = str(e)
+    if message == ErrorMessages.INVALID_CURSOR or message.startswith(ErrorMessages.UNKNOWN_FIELDS):
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=message)
+
+def segment_filters(
+    is_transcribed: Optional[bool] = Query(None, alias="isTranscribed"),
+    is_translated: Optional[bool] = Query(None, alias="isTranslated"),
+    is_approved: Optional[bool] = Query(None, alias="isApproved"),
+    genre: Optional[str] = Query(None),
+    processing_method: Optional[str] = Query(None, alias="processingMethod")
+) -> dict:
+    return {
+        "is_transcribed": is_transcribed,
+        "is_translated": is_translated,
+        "is_approved": is_approved,
+        "genre": genre,
+        "processing_method": processing_method,
+    }
+
 @router.get("/{segment_id}", response_model=SegmentResponse)
 def get_segment_by_id(
     segment_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        segment = get_segment_by_id_service(db, segment_id, current_user)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    # Revalidate against a hash of the representation so editors polling a segment get 304s
+    etag = content_etag(segment.json().encode())
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if is_not_modified(request, etag, None):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return segment
+
+@router.get("/{segment_id}/peaks", response_model=PeaksResponse)
+def get_segment_peaks(
+    segment_id: int,
+    zoom: int = Query(0, ge=0),
+    start: Optional[float] = Query(None, ge=0),
+    end: Optional[float] = Query(None, ge=0),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
-        return get_segment_by_id_service(db, segment_id, current_user)
+        return get_segment_peaks_service(db, segment_id, current_user, zoom, start, end)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -35,7 +88,7 @@ def get_segment_by_id(
 def update_segment_endpoint(
     segment_id: int,
     segment_update: SegmentUpdate,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -49,35 +102,43 @@ def update_segment_endpoint(
 @router.get("/project/{project_id}", response_model=List[SegmentResponse])
 def get_project_segments(
     project_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.SEGMENT_PAGE_MAX_SIZE),
+    filters: dict = Depends(segment_filters),
+    fields: Optional[str] = Query(None, max_length=1000),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """Segments in order; with ``limit`` or ``cursor`` one page, the next page's cursor in X-Next-Cursor.
+    ``fields`` is a comma-separated list of response fields to return instead of all of them."""
     try:
-        return get_project_segments_service(db, project_id, current_user)
+        body, next_page = get_project_segments_service(db, project_id, current_user, cursor, limit, filters, fields)
     except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
+        raise list_error(e)
+    return json_response(body, {NEXT_CURSOR_HEADER: next_page} if next_page else None)
 
 @router.get("/folder/{folder_id}", response_model=List[SegmentResponse])
 def get_folder_segments(
     folder_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.SEGMENT_PAGE_MAX_SIZE),
+    filters: dict = Depends(segment_filters),
+    fields: Optional[str] = Query(None, max_length=1000),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    """Segments in order; with ``limit`` or ``cursor`` one page, the next page's cursor in X-Next-Cursor.
+    ``fields`` is a comma-separated list of response fields to return instead of all of them."""
     try:
-        return get_folder_segments_service(db, folder_id, current_user)
+        body, next_page = get_folder_segments_service(db, folder_id, current_user, cursor, limit, filters, fields)
     except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
+        raise list_error(e)
+    return json_response(body, {NEXT_CURSOR_HEADER: next_page} if next_page else None)
 
 @router.delete("/{segment_id}", response_model=MessageResponse)
 def delete_segment_endpoint(
     segment_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -88,10 +149,11 @@ def delete_segment_endpoint(
             detail=str(e)
         )
 
-@router.get("/{segment_id}/audio")
+@router.api_route("/{segment_id}/audio", methods=["GET", "HEAD"])
 def get_segment_audio(
     segment_id: int,
-    current_user: UserModel = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -111,37 +173,14 @@ def get_segment_audio(
             )
         
         # Check if the audio file exists
-        if not segment.file_path or not os.path.exists(segment.file_path):
+        identity = get_file_identity(segment.file_path, segment.file_key) if segment.file_path else None
+        if identity is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Audio file not found"
             )
         
-        # Determine the media type based on file extension
-        file_extension = os.path.splitext(segment.file_path)[1].lower()
-        media_type_map = {
-            '.mp3': 'audio/mpeg',
-            '.wav': 'audio/wav',
-            '.m4a': 'audio/mp4',
-            '.aac': 'audio/aac',
-            '.ogg': 'audio/ogg',
-            '.flac': 'audio/flac'
-        }
-        media_type = media_type_map.get(file_extension, 'audio/mpeg')
-        
-        # Read and return the audio file
-        with open(segment.file_path, 'rb') as audio_file:
-            audio_content = audio_file.read()
-        
-        from fastapi.responses import Response
-        return Response(
-            content=audio_content,
-            media_type=media_type,
-            headers={
-                "Content-Disposition": f"inline; filename={segment.original_filename}",
-                "Cache-Control": "public, max-age=3600"
-            }
-        )
+        return segment_audio_response(request, segment, identity)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.principals import Principal
+from app.core.deps import get_current_admin_user
+from app.services.storage_service import get_storage_stats, sweep_unreferenced_blobs
+
+router = APIRouter()
+
+@router.get("/stats", response_model=dict)
+def get_storage_stats_endpoint(
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    return get_storage_stats()
+
+@router.post("/sweep", response_model=dict)
+def sweep_storage(
+    min_age_seconds: int = 3600,
+    current_user: Principal = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    return {"removedBlobs": sweep_unreferenced_blobs(db, min_age_seconds)}
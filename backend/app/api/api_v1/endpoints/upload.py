@@ -1,21 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Header, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
+from app.core.principals import Principal
 from app.core.deps import get_current_user
 from app.services.upload_service import process_batch_upload_service
-from app.schemas.response import MessageResponse
-from app.models.user import User as UserModel
+from app.services.resumable_upload_service import (
+    create_upload_session_service, get_upload_session_service, write_upload_chunk_service,
+    finalize_upload_service, cancel_upload_service
+)
+from app.schemas.upload import UploadSessionCreate
+from app.schemas.response import MessageResponse, UploadSessionResponse
 from app.constants import ErrorMessages
 
 router = APIRouter()
 
+UPLOAD_ERROR_STATUS = {
+    ErrorMessages.UPLOAD_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorMessages.UPLOAD_OFFSET_MISMATCH: status.HTTP_409_CONFLICT,
+    ErrorMessages.UPLOAD_IN_PROGRESS: status.HTTP_409_CONFLICT,
+    ErrorMessages.UPLOAD_TOO_LARGE: status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+}
+
+
+def upload_error(e: ValueError) -> HTTPException:
+    return HTTPException(
+        status_code=UPLOAD_ERROR_STATUS.get(str(e), status.HTTP_400_BAD_REQUEST),
+        detail=str(e)
+    )
+
+
+def upload_headers(upload: UploadSessionResponse) -> dict:
+    return {
+        "Upload-Offset": str(upload.uploadOffset),
+        "Upload-Length": str(upload.uploadLength),
+        "Cache-Control": "no-store"
+    }
+
 @router.post("/upload-batch", response_model=MessageResponse)
 def upload_batch(
     files: List[UploadFile] = File(...),
     project_name: Optional[str] = Form(None),
     language_id: Optional[int] = Form(None),
-    current_user: UserModel = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -25,3 +52,82 @@ def upload_batch(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload(
+    upload_data: UploadSessionCreate,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        upload = create_upload_session_service(db, upload_data, current_user)
+    except ValueError as e:
+        raise upload_error(e)
+    response.headers.update(upload_headers(upload))
+    response.headers["Location"] = f"/api/v1/uploads/{upload.id}"
+    return upload
+
+@router.head("/uploads/{upload_id}")
+def get_upload_offset(
+    upload_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        upload = get_upload_session_service(db, upload_id, current_user)
+    except ValueError as e:
+        raise upload_error(e)
+    return Response(status_code=status.HTTP_200_OK, headers=upload_headers(upload))
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload(
+    upload_id: str,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        upload = get_upload_session_service(db, upload_id, current_user)
+    except ValueError as e:
+        raise upload_error(e)
+    response.headers.update(upload_headers(upload))
+    return upload
+
+@router.patch("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(...),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        upload = await write_upload_chunk_service(db, upload_id, upload_offset, request.stream(), current_user)
+    except ValueError as e:
+        raise upload_error(e)
+    response.headers.update(upload_headers(upload))
+    return upload
+
+@router.post("/uploads/{upload_id}/finalize", response_model=UploadSessionResponse)
+def finalize_upload(
+    upload_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        return finalize_upload_service(db, upload_id, current_user)
+    except ValueError as e:
+        raise upload_error(e)
+
+@router.delete("/uploads/{upload_id}", response_model=MessageResponse)
+def cancel_upload(
+    upload_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        return cancel_upload_service(db, upload_id, current_user)
+    except ValueError as e:
+        raise upload_error(e)
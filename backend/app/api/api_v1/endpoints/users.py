@@ -1,36 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.principals import Principal
 from app.core.deps import get_current_user, get_current_manager_user, get_current_admin_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.serialization import json_response
 from app.services.user_service import (
     get_all_users, create_user_service, update_user_service,
     deactivate_user_service, delete_user_service, reset_user_password_service, get_user_stats_service
 )
 from app.schemas.user import UserCreate, UserUpdate
 from app.schemas.response import UserResponse, MessageResponse
-from app.models.user import User as UserModel
 from app.constants import ErrorMessages
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
 def get_all_users_endpoint(
-    current_user: UserModel = Depends(get_current_manager_user),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.USER_PAGE_MAX_SIZE),
+    search: Optional[str] = Query(None, min_length=1, max_length=100),
+    role: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None, alias="isActive"),
+    current_user: Principal = Depends(get_current_manager_user),
     db: Session = Depends(get_db)
 ):
+    """Users by username, one page at a time; the next page's cursor is in X-Next-Cursor"""
     try:
-        return get_all_users(db)
+        body, next_page = get_all_users(db, cursor, limit, search, role, is_active)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    return json_response(body, {NEXT_CURSOR_HEADER: next_page} if next_page else None)
 
 @router.post("/", response_model=UserResponse)
 def create_new_user(
     user_data: UserCreate,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -45,7 +55,7 @@ def create_new_user(
 def update_user_endpoint(
     user_id: str,
     user_update: UserUpdate,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -59,7 +69,7 @@ def update_user_endpoint(
 @router.patch("/{user_id}/deactivate", response_model=UserResponse)
 def deactivate_user_endpoint(
     user_id: str,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -73,7 +83,7 @@ def deactivate_user_endpoint(
 @router.delete("/{user_id}", response_model=MessageResponse)
 def delete_user_endpoint(
     user_id: str,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -88,7 +98,7 @@ def delete_user_endpoint(
 def reset_user_password_endpoint(
     user_id: str,
     new_password: str,
-    current_user: UserModel = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     try:
@@ -102,7 +112,7 @@ def reset_user_password_endpoint(
 @router.get("/{user_id}/stats", response_model=dict)
 def get_user_stats_endpoint(
     user_id: str,
-    current_user: UserModel = Depends(get_current_manager_user),
+    current_user: Principal = Depends(get_current_manager_user),
     db: Session = Depends(get_db)
 ):
     try:
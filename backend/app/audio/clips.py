@@ -0,0 +1,130 @@
+"""Address a time window of a recording as bytes without copying it.
+
+A clip is described as ``(prefix, offset, length)``: the response body is
+``prefix`` followed by ``length`` bytes of the parent file from ``offset``.
+PCM WAV clips get a freshly written header; MP3 clips are cut on frame
+boundaries and need no header at all.
+"""
+import os
+import struct
+from array import array
+from functools import lru_cache
+from typing import Optional
+from app.audio.headers import (
+    parse_wav, _skip_id3v2, _find_first_mp3_frame, _mp3_vbr_info, _parse_mp3_frame_header
+)
+
+WAVE_FORMAT_PCM = 1
+MP3_INDEX_READ_SIZE = 1024 * 1024
+
+
+def wav_header(format_tag: int, channels: int, sample_rate: int, block_align: int,
+               bits_per_sample: int, data_size: int) -> bytes:
+    # Non-PCM formats carry an (empty) cbSize field
+    fmt = struct.pack('<HHIIHH', format_tag, channels, sample_rate,
+                      sample_rate * block_align, block_align, bits_per_sample)
+    if format_tag != WAVE_FORMAT_PCM:
+        fmt += struct.pack('<H', 0)
+    riff_size = 4 + 8 + len(fmt) + 8 + data_size + (data_size % 2)
+    return (
+        b'RIFF' + struct.pack('<I', riff_size) + b'WAVE'
+        + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        + b'data' + struct.pack('<I', data_size)
+    )
+
+
+def _plan_wav_clip(file_path: str, start: float, end: Optional[float]) -> Optional[tuple]:
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        header = parse_wav(f, file_size)
+    if not header or not header['block_align']:
+        return None
+    
+    block_align = header['block_align']
+    total_frames = header['data_size'] // block_align
+    first = min(int(round(start * header['sample_rate'])), total_frames)
+    last = total_frames if end is None else min(int(round(end * header['sample_rate'])), total_frames)
+    last = max(last, first)
+    data_size = (last - first) * block_align
+    
+    prefix = wav_header(
+        header['format_tag'], header['channels'], header['sample_rate'],
+        block_align, header['bits_per_sample'], data_size
+    )
+    return prefix, header['data_offset'] + first * block_align, data_size
+
+
+@lru_cache(maxsize=8)
+def _mp3_frame_index(file_path: str, file_size: int, mtime: float) -> Optional[tuple]:
+    """Byte offset of every audio frame, cached per file version.
+
+    Returns (offsets, samples_per_frame, sample_rate). A leading Xing/Info/VBRI
+    frame carries no audio and is left out.
+    """
+    with open(file_path, 'rb') as f:
+        located = _find_first_mp3_frame(f, _skip_id3v2(f), file_size)
+        if not located:
+            return None
+        position, frame = located
+        if _mp3_vbr_info(f, position, frame):
+            position += frame['frame_length']
+        
+        offsets = array('q')
+        f.seek(position)
+        buffer = f.read(MP3_INDEX_READ_SIZE)
+        buffer_start = position
+        while True:
+            relative = position - buffer_start
+            if relative + 4 > len(buffer):
+                f.seek(position)
+                buffer = f.read(MP3_INDEX_READ_SIZE)
+                buffer_start = position
+                relative = 0
+                if len(buffer) < 4:
+                    break
+            current = _parse_mp3_frame_header(buffer[relative:relative + 4])
+            # Trailing tags or a change of stream layout end the audio
+            if not current or current['sample_rate'] != frame['sample_rate']:
+                break
+            offsets.append(position)
+            position += current['frame_length']
+        offsets.append(min(position, file_size))
+    
+    return offsets, frame['samples_per_frame'], frame['sample_rate']
+
+
+def _plan_mp3_clip(file_path: str, start: float, end: Optional[float]) -> Optional[tuple]:
+    stat_result = os.stat(file_path)
+    index = _mp3_frame_index(file_path, stat_result.st_size, stat_result.st_mtime)
+    if not index:
+        return None
+    offsets, samples_per_frame, sample_rate = index
+    frame_count = len(offsets) - 1
+    
+    frame_seconds = samples_per_frame / sample_rate
+    first = min(int(start / frame_seconds), frame_count)
+    last = frame_count if end is None else min(int(-(-end // frame_seconds)), frame_count)
+    last = max(last, first)
+    return b'', offsets[first], offsets[last] - offsets[first]
+
+
+CLIP_PLANNERS = {
+    '.wav': _plan_wav_clip,
+    '.mp3': _plan_mp3_clip,
+}
+
+
+def can_clip(file_path: str) -> bool:
+    """Whether windows of this file's format can be served as clips of the stored file"""
+    return os.path.splitext(file_path)[1].lower() in CLIP_PLANNERS
+
+
+def plan_clip(file_path: str, start: float, end: Optional[float]) -> Optional[tuple]:
+    """Return (prefix, offset, length) for the [start, end) seconds of a file, or None when it cannot be cut here"""
+    planner = CLIP_PLANNERS.get(os.path.splitext(file_path)[1].lower())
+    if not planner:
+        return None
+    try:
+        return planner(file_path, max(start, 0.0), end)
+    except (OSError, struct.error, ValueError, KeyError):
+        return None
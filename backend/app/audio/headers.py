@@ -0,0 +1,279 @@
+"""Exact duration, sample rate and channel count from container headers.
+
+Only headers and frame/page boundaries are read, never the encoded audio, so
+probing a multi-hour file costs a handful of small reads.
+"""
+import os
+import struct
+from typing import BinaryIO, Optional
+
+MP3_SCAN_WINDOW = 64 * 1024
+OGG_TAIL_WINDOW = 64 * 1024
+
+MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+
+
+def _result(duration: float, sample_rate: int, channels: int, **extra) -> dict:
+    return {'duration': duration, 'sample_rate': sample_rate, 'channels': channels, **extra}
+
+
+def _skip_id3v2(f: BinaryIO) -> int:
+    """Return the offset of the first byte after an ID3v2 tag (0 when there is none)"""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b'ID3':
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        footer = 10 if header[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def parse_wav(f: BinaryIO, file_size: int) -> Optional[dict]:
+    """Parse a RIFF/WAVE header.
+
+    Besides duration/sample_rate/channels the result carries ``data_offset``,
+    ``data_size``, ``block_align``, ``bits_per_sample`` and ``format_tag`` so
+    callers can address PCM frames directly.
+    """
+    f.seek(0)
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+        return None
+    
+    fmt = None
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        if chunk_id == b'fmt ':
+            body = f.read(chunk_size)
+            if len(body) < 16:
+                return None
+            fmt = list(struct.unpack('<HHIIHH', body[:16]))
+            if fmt[0] == 0xFFFE and len(body) >= 26:
+                # WAVE_FORMAT_EXTENSIBLE keeps the real format tag at the start of the SubFormat GUID
+                fmt[0] = struct.unpack('<H', body[24:26])[0]
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            format_tag, channels, sample_rate, byte_rate, block_align, bits_per_sample = fmt
+            data_offset = f.tell()
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF, trust the file length instead
+            available = file_size - data_offset
+            data_size = chunk_size if 0 < chunk_size <= available else available
+            if not byte_rate:
+                return None
+            return _result(
+                data_size / byte_rate, sample_rate, channels,
+                data_offset=data_offset,
+                data_size=data_size,
+                block_align=block_align,
+                bits_per_sample=bits_per_sample,
+                format_tag=format_tag
+            )
+        else:
+            f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+
+def parse_flac(f: BinaryIO, file_size: int) -> Optional[dict]:
+    """Read total samples, rate and channels from the FLAC STREAMINFO block"""
+    offset = _skip_id3v2(f)
+    f.seek(offset)
+    if f.read(4) != b'fLaC':
+        return None
+    
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    streaminfo = f.read(34)
+    if len(streaminfo) < 34:
+        return None
+    
+    packed = int.from_bytes(streaminfo[10:18], 'big')
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate:
+        return None
+    return _result(total_samples / sample_rate, sample_rate, channels)
+
+
+def _parse_mp3_frame_header(header: bytes) -> Optional[dict]:
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    
+    version_bits = (header[1] >> 3) & 0x3
+    layer_bits = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    
+    version = {0: 2.5, 2: 2, 3: 1}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header[2] >> 1) & 0x1
+    channels = 1 if (header[3] >> 6) == 3 else 2
+    
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or version == 1:
+        samples_per_frame = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples_per_frame = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+    
+    return {
+        'version': version,
+        'layer': layer,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'samples_per_frame': samples_per_frame,
+        'frame_length': frame_length,
+    }
+
+
+def _find_first_mp3_frame(f: BinaryIO, start: int, file_size: int) -> Optional[tuple]:
+    f.seek(start)
+    window = f.read(MP3_SCAN_WINDOW)
+    position = window.find(b'\xff')
+    while 0 <= position < len(window) - 4:
+        frame = _parse_mp3_frame_header(window[position:position + 4])
+        if frame:
+            # Require the following frame to line up so stray 0xFF bytes are not taken for a sync word
+            next_offset = start + position + frame['frame_length']
+            f.seek(next_offset)
+            if next_offset + 4 > file_size or _parse_mp3_frame_header(f.read(4)):
+                return start + position, frame
+        position = window.find(b'\xff', position + 1)
+    return None
+
+
+def _mp3_vbr_info(f: BinaryIO, offset: int, frame: dict) -> Optional[tuple]:
+    """(frame_count, trimmed_samples) from a Xing/Info or VBRI header in the first frame, if present"""
+    f.seek(offset)
+    data = f.read(frame['frame_length'])
+    if frame['version'] == 1:
+        xing_offset = 4 + (17 if frame['channels'] == 1 else 32)
+    else:
+        xing_offset = 4 + (9 if frame['channels'] == 1 else 17)
+    
+    tag = data[xing_offset:xing_offset + 4]
+    if tag in (b'Xing', b'Info') and len(data) >= xing_offset + 12:
+        flags = struct.unpack('>I', data[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x1:
+            frame_count = struct.unpack('>I', data[xing_offset + 8:xing_offset + 12])[0]
+            # Skip the optional frames/bytes/TOC/quality fields to reach a LAME tag
+            position = xing_offset + 8
+            for flag, size in ((0x1, 4), (0x2, 4), (0x4, 100), (0x8, 4)):
+                if flags & flag:
+                    position += size
+            trimmed = 0
+            if data[position:position + 4] in (b'LAME', b'Lavf', b'Lavc') and len(data) >= position + 24:
+                b0, b1, b2 = data[position + 21:position + 24]
+                trimmed = ((b0 << 4) | (b1 >> 4)) + (((b1 & 0x0F) << 8) | b2)
+            return frame_count, trimmed
+    
+    if data[36:40] == b'VBRI' and len(data) >= 54:
+        return struct.unpack('>I', data[50:54])[0], 0
+    return None
+
+def parse_mp3(f: BinaryIO, file_size: int) -> Optional[dict]:
+    """Use the Xing/Info or VBRI frame count, otherwise walk the frame headers"""
+    located = _find_first_mp3_frame(f, _skip_id3v2(f), file_size)
+    if not located:
+        return None
+    offset, frame = located
+    
+    vbr_info = _mp3_vbr_info(f, offset, frame)
+    if vbr_info:
+        frame_count, trimmed = vbr_info
+    else:
+        trimmed = 0
+        # Seek from header to header, reading 4 bytes per frame
+        frame_count = 0
+        position = offset
+        while position + 4 <= file_size:
+            f.seek(position)
+            current = _parse_mp3_frame_header(f.read(4))
+            if not current:
+                break
+            frame_count += 1
+            position += current['frame_length']
+    
+    total_samples = max(frame_count * frame['samples_per_frame'] - trimmed, 0)
+    duration = total_samples / frame['sample_rate']
+    return _result(duration, frame['sample_rate'], frame['channels'])
+
+
+def parse_ogg(f: BinaryIO, file_size: int) -> Optional[dict]:
+    """Divide the last page's granule position by the Vorbis or Opus sample rate"""
+    f.seek(0)
+    first_page = f.read(512)
+    if first_page[:4] != b'OggS' or len(first_page) < 28:
+        return None
+    
+    segment_count = first_page[26]
+    packet = first_page[27 + segment_count:]
+    if packet[:7] == b'\x01vorbis' and len(packet) >= 16:
+        channels = packet[11]
+        sample_rate = struct.unpack('<I', packet[12:16])[0]
+        clock_rate, pre_skip = sample_rate, 0
+    elif packet[:8] == b'OpusHead' and len(packet) >= 16:
+        channels = packet[9]
+        pre_skip = struct.unpack('<H', packet[10:12])[0]
+        sample_rate = struct.unpack('<I', packet[12:16])[0] or 48000
+        clock_rate = 48000  # Opus granule positions always count 48kHz samples
+    else:
+        return None
+    
+    tail_start = max(0, file_size - OGG_TAIL_WINDOW)
+    f.seek(tail_start)
+    tail = f.read(OGG_TAIL_WINDOW)
+    last_page = tail.rfind(b'OggS')
+    if last_page < 0 or len(tail) < last_page + 14 or not clock_rate:
+        return None
+    granule = struct.unpack('<q', tail[last_page + 6:last_page + 14])[0]
+    return _result(max(granule - pre_skip, 0) / clock_rate, sample_rate, channels)
+
+
+PARSERS = {
+    '.wav': parse_wav,
+    '.flac': parse_flac,
+    '.mp3': parse_mp3,
+    '.ogg': parse_ogg,
+    '.opus': parse_ogg,
+}
+
+
+def read_audio_header(file_path: str, filename: Optional[str] = None) -> Optional[dict]:
+    """Return exact metadata for WAV, FLAC, MP3 and Ogg files, or None if the header is not understood"""
+    file_extension = os.path.splitext(filename or file_path)[1].lower()
+    parser = PARSERS.get(file_extension)
+    if not parser:
+        return None
+    
+    try:
+        file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            return parser(f, file_size)
+    except (OSError, struct.error, ValueError, KeyError, IndexError):
+        return None
@@ -0,0 +1,89 @@
+"""Stream decoded audio as fixed-size blocks of mono float32 samples.
+
+PCM WAV is read directly; other formats are decoded through an ``ffmpeg``
+pipe when the binary is installed. Only one block is held in memory at a time.
+"""
+import shutil
+import subprocess
+from typing import Iterator, Optional
+import numpy as np
+from app.audio.headers import read_audio_header
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+FFMPEG_SAMPLE_RATE = 16000
+
+
+def _decode_pcm(raw: bytes, bits_per_sample: int, format_tag: int) -> Optional[np.ndarray]:
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        dtype = {32: '<f4', 64: '<f8'}.get(bits_per_sample)
+        return np.frombuffer(raw, dtype=dtype).astype(np.float32) if dtype else None
+    if bits_per_sample == 8:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if bits_per_sample == 16:
+        return np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    if bits_per_sample == 24:
+        triples = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608.0
+    if bits_per_sample == 32:
+        return np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    return None
+
+
+def iter_wav_blocks(file_path: str, header: dict, block_seconds: float) -> Iterator[np.ndarray]:
+    channels = header['channels']
+    block_align = header['block_align']
+    block_bytes = max(int(header['sample_rate'] * block_seconds), 1) * block_align
+    remaining = header['data_size'] - header['data_size'] % block_align
+    
+    with open(file_path, 'rb') as f:
+        f.seek(header['data_offset'])
+        while remaining > 0:
+            raw = f.read(min(block_bytes, remaining))
+            raw = raw[:len(raw) - len(raw) % block_align]
+            if not raw:
+                break
+            remaining -= len(raw)
+            samples = _decode_pcm(raw, header['bits_per_sample'], header['format_tag'])
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1)
+            yield samples
+
+
+def iter_ffmpeg_blocks(file_path: str, block_seconds: float) -> Iterator[np.ndarray]:
+    block_bytes = int(FFMPEG_SAMPLE_RATE * block_seconds) * 2
+    process = subprocess.Popen(
+        ['ffmpeg', '-nostdin', '-v', 'error', '-i', file_path,
+         '-f', 's16le', '-ac', '1', '-ar', str(FFMPEG_SAMPLE_RATE), '-'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            raw = process.stdout.read(block_bytes)
+            if not raw:
+                break
+            raw = raw[:len(raw) - len(raw) % 2]
+            yield np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+
+
+def open_audio_blocks(file_path: str, filename: str, block_seconds: float = 10.0) -> Optional[tuple]:
+    """Return (sample_rate, block iterator) for a file, or None when it cannot be decoded here"""
+    header = read_audio_header(file_path, filename)
+    if (
+        header is not None
+        and 'data_offset' in header
+        and header['format_tag'] in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT)
+        and _decode_pcm(b'', header['bits_per_sample'], header['format_tag']) is not None
+    ):
+        return header['sample_rate'], iter_wav_blocks(file_path, header, block_seconds)
+    
+    if shutil.which('ffmpeg'):
+        return FFMPEG_SAMPLE_RATE, iter_ffmpeg_blocks(file_path, block_seconds)
+    return None
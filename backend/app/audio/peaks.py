@@ -0,0 +1,159 @@
+"""Multi-resolution min/max waveform peaks stored as a binary sidecar.
+
+The finest level holds one signed 8-bit (min, max) pair per
+``BASE_SAMPLES_PER_PIXEL`` samples; every further level merges
+``LEVEL_FACTOR`` pixels of the one before until the whole recording fits in a
+few hundred pixels. The sidecar sits next to the audio file as
+``<file>.peaks``:
+
+    header   '<4sHHI'  magic, version, level count, sample rate
+    levels   '<IIQ'    samples per pixel, pixel count, data offset (per level)
+    data     int8      interleaved min/max pairs, finest level first
+"""
+import os
+import struct
+import tempfile
+from typing import List, Optional
+import numpy as np
+from app.audio.pcm import open_audio_blocks
+
+PEAKS_SUFFIX = ".peaks"
+PEAKS_MAGIC = b"NVPK"
+PEAKS_VERSION = 1
+BASE_SAMPLES_PER_PIXEL = 256
+LEVEL_FACTOR = 4
+MIN_LEVEL_PIXELS = 512
+
+HEADER_FORMAT = '<4sHHI'
+LEVEL_FORMAT = '<IIQ'
+
+
+def peaks_path(file_path: str) -> str:
+    return file_path + PEAKS_SUFFIX
+
+
+class PeaksBuilder:
+    """Accumulate the finest peaks level from mono float32 blocks"""
+
+    def __init__(self, sample_rate: int, samples_per_pixel: int = BASE_SAMPLES_PER_PIXEL):
+        self.sample_rate = sample_rate
+        self.samples_per_pixel = samples_per_pixel
+        self.carry = np.zeros(0, dtype=np.float32)
+        self.parts = []
+
+    def _append(self, frames: np.ndarray) -> None:
+        pairs = np.stack((frames.min(axis=1), frames.max(axis=1)), axis=1)
+        self.parts.append(np.clip(np.round(pairs * 127.0), -128, 127).astype(np.int8))
+
+    def feed(self, samples: np.ndarray) -> None:
+        if self.carry.size:
+            samples = np.concatenate((self.carry, samples))
+        pixel_count = samples.size // self.samples_per_pixel
+        self.carry = samples[pixel_count * self.samples_per_pixel:].copy()
+        if pixel_count:
+            self._append(samples[:pixel_count * self.samples_per_pixel].reshape(pixel_count, -1))
+
+    def levels(self) -> List[tuple]:
+        """Return (samples_per_pixel, pairs) for every level, finest first"""
+        if self.carry.size:
+            self._append(self.carry.reshape(1, -1))
+            self.carry = np.zeros(0, dtype=np.float32)
+        pairs = np.concatenate(self.parts) if self.parts else np.zeros((0, 2), dtype=np.int8)
+        self.parts = [pairs]
+        
+        levels = [(self.samples_per_pixel, pairs)]
+        while len(pairs) > MIN_LEVEL_PIXELS:
+            starts = np.arange(0, len(pairs), LEVEL_FACTOR)
+            pairs = np.stack((
+                np.minimum.reduceat(pairs[:, 0], starts),
+                np.maximum.reduceat(pairs[:, 1], starts)
+            ), axis=1)
+            levels.append((levels[-1][0] * LEVEL_FACTOR, pairs))
+        return levels
+
+    def write(self, path: str) -> None:
+        levels = self.levels()
+        offset = struct.calcsize(HEADER_FORMAT) + struct.calcsize(LEVEL_FORMAT) * len(levels)
+        # A unique temp file per writer, so concurrent first requests for the same
+        # recording cannot write over each other before the rename
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(struct.pack(HEADER_FORMAT, PEAKS_MAGIC, PEAKS_VERSION, len(levels), self.sample_rate))
+                for samples_per_pixel, pairs in levels:
+                    f.write(struct.pack(LEVEL_FORMAT, samples_per_pixel, len(pairs), offset))
+                    offset += pairs.size
+                for _, pairs in levels:
+                    f.write(pairs.tobytes())
+            # Readers never see a half-written sidecar
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def build_peaks_file(file_path: str, filename: str) -> bool:
+    """Decode a recording and write its sidecar, returning False when it cannot be decoded here"""
+    opened = open_audio_blocks(file_path, filename)
+    if opened is None:
+        return False
+    sample_rate, blocks = opened
+    builder = PeaksBuilder(sample_rate)
+    for block in blocks:
+        builder.feed(block)
+    builder.write(peaks_path(file_path))
+    return True
+
+
+def read_peaks_window(
+    path: str,
+    zoom: int = 0,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    max_pixels: int = 20000
+) -> Optional[dict]:
+    """Read the pairs covering [start, end) seconds at one level of a sidecar.
+
+    ``zoom`` 0 is the coarsest level and each step is ``LEVEL_FACTOR`` times
+    finer. If the window would exceed ``max_pixels`` a coarser level is used.
+    """
+    with open(path, "rb") as f:
+        header = f.read(struct.calcsize(HEADER_FORMAT))
+        if len(header) < struct.calcsize(HEADER_FORMAT):
+            return None
+        magic, version, level_count, sample_rate = struct.unpack(HEADER_FORMAT, header)
+        if magic != PEAKS_MAGIC or version != PEAKS_VERSION or not level_count:
+            return None
+        table = f.read(struct.calcsize(LEVEL_FORMAT) * level_count)
+        levels = list(struct.iter_unpack(LEVEL_FORMAT, table))
+        
+        # Stored finest first; zoom counts from the coarsest end
+        zoom_levels = len(levels)
+        zoom = min(max(zoom, 0), zoom_levels - 1)
+        index = zoom_levels - 1 - zoom
+        while True:
+            samples_per_pixel, pixel_count, offset = levels[index]
+            first = max(int(start * sample_rate // samples_per_pixel), 0)
+            last = pixel_count if end is None else int(-(-end * sample_rate // samples_per_pixel))
+            last = min(max(last, first), pixel_count)
+            if last - first <= max_pixels or index == zoom_levels - 1:
+                break
+            index += 1
+            zoom -= 1
+        
+        f.seek(offset + first * 2)
+        data = np.frombuffer(f.read((last - first) * 2), dtype=np.int8)
+    
+    return {
+        'sample_rate': sample_rate,
+        'samples_per_pixel': samples_per_pixel,
+        'zoom': zoom,
+        'zoom_levels': zoom_levels,
+        'start': first * samples_per_pixel / sample_rate,
+        'end': last * samples_per_pixel / sample_rate,
+        'length': last - first,
+        'data': data.tolist()
+    }
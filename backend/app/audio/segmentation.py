@@ -0,0 +1,163 @@
+"""Split long recordings at pauses using frame-energy voice activity detection.
+
+Frame energies are computed with NumPy one block at a time and only silence
+runs are walked in Python, so memory stays constant and the cost per hour of
+audio is a fraction of a second.
+"""
+from typing import Iterable, List, Optional
+import numpy as np
+
+SILENCE_DB = -60.0  # frames below this are silent whatever the surroundings
+
+
+class EnergySegmenter:
+    """Incrementally find cut points in a stream of mono float32 blocks.
+
+    A frame is silent when its energy is both within ``threshold_db`` of an
+    adaptive noise floor and at least ``threshold_db`` under the block's loud
+    frames. Once a segment is at least ``min_segment`` seconds long, the next
+    pause of ``min_pause`` seconds ends it at the pause midpoint. A
+    segment reaching ``max_segment`` seconds is cut at the longest shorter
+    pause seen, or hard cut if there was none.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: float = 30.0,
+        min_pause: float = 0.5,
+        min_segment: float = 5.0,
+        max_segment: float = 30.0,
+        threshold_db: float = 10.0,
+        floor_rise_db: float = 1.0
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+        self.frame_seconds = self.frame_length / sample_rate
+        self.min_pause_frames = max(int(round(min_pause / self.frame_seconds)), 1)
+        self.min_segment_frames = int(round(min_segment / self.frame_seconds))
+        self.max_segment_frames = max(int(round(max_segment / self.frame_seconds)), self.min_segment_frames + 1)
+        self.threshold_db = threshold_db
+        self.floor_rise_db = floor_rise_db
+        
+        self.noise_floor_db = None
+        self.carry = np.zeros(0, dtype=np.float32)
+        self.frames_seen = 0
+        self.open_run_start = None
+        self.segment_start = 0
+        self.best_short_pause = None
+        self.cuts = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        if self.carry.size:
+            samples = np.concatenate((self.carry, samples))
+        frame_count = samples.size // self.frame_length
+        self.carry = samples[frame_count * self.frame_length:].copy()
+        if not frame_count:
+            return
+        
+        frames = samples[:frame_count * self.frame_length].reshape(frame_count, self.frame_length)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        
+        # The floor follows quiet passages down immediately but only creeps up,
+        # so a long stretch of speech does not get classified as background
+        block_floor = float(np.percentile(energy_db, 10))
+        if self.noise_floor_db is None:
+            self.noise_floor_db = block_floor
+        else:
+            self.noise_floor_db = min(self.noise_floor_db + self.floor_rise_db, block_floor)
+        # Keep the threshold well under the loud frames too, so a block with
+        # only brief pauses does not pull the floor up to speech level
+        speech_db = float(np.percentile(energy_db, 90))
+        threshold = min(self.noise_floor_db + self.threshold_db, speech_db - self.threshold_db)
+        silent = (energy_db < threshold) | (energy_db < SILENCE_DB)
+        
+        padded = np.concatenate(([0], silent.astype(np.int8), [0]))
+        edges = np.diff(padded)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        offset = self.frames_seen
+        
+        if self.open_run_start is not None and not silent[0]:
+            self._on_pause(self.open_run_start, offset)
+            self.open_run_start = None
+        
+        for start, end in zip(run_starts, run_ends):
+            global_start = offset + int(start)
+            if start == 0 and self.open_run_start is not None:
+                global_start = self.open_run_start
+                self.open_run_start = None
+            if end == frame_count:
+                self.open_run_start = global_start
+                break
+            self._on_pause(global_start, offset + int(end))
+        
+        self.frames_seen += frame_count
+        self._force_cuts(self.frames_seen if self.open_run_start is None else self.open_run_start)
+
+    def _cut(self, frame: int, confidence: float) -> None:
+        self.cuts.append((self.segment_start, frame, confidence))
+        self.segment_start = frame
+        self.best_short_pause = None
+
+    def _on_pause(self, start: int, end: int) -> None:
+        self._force_cuts(start)
+        midpoint = min((start + end) // 2, self.segment_start + self.max_segment_frames)
+        length = end - start
+        if midpoint - self.segment_start < self.min_segment_frames:
+            return
+        if length >= self.min_pause_frames:
+            confidence = 0.5 + 0.5 * min(1.0, length / (2 * self.min_pause_frames))
+            self._cut(midpoint, min(confidence, 0.99))
+        elif self.best_short_pause is None or length > self.best_short_pause[1]:
+            self.best_short_pause = (midpoint, length)
+
+    def _force_cuts(self, position: int) -> None:
+        while position - self.segment_start > self.max_segment_frames:
+            if self.best_short_pause is not None:
+                midpoint, length = self.best_short_pause
+                self._cut(midpoint, 0.3 + 0.2 * length / self.min_pause_frames)
+            else:
+                self._cut(self.segment_start + self.max_segment_frames, 0.2)
+
+    def finish(self) -> List[tuple]:
+        """Return (start_seconds, end_seconds, confidence) for every segment"""
+        total_frames = self.frames_seen
+        self._force_cuts(total_frames)
+        segments = list(self.cuts)
+        if total_frames > self.segment_start:
+            tail = (self.segment_start, total_frames, 0.99)
+            short_tail = total_frames - self.segment_start < self.min_segment_frames
+            if segments and short_tail and total_frames - segments[-1][0] <= self.max_segment_frames:
+                # Fold a short tail into the previous segment instead of emitting a fragment
+                start, _, confidence = segments.pop()
+                tail = (start, total_frames, confidence)
+            segments.append(tail)
+        
+        result = [
+            (start * self.frame_seconds, end * self.frame_seconds, confidence)
+            for start, end, confidence in segments
+        ]
+        if result and self.carry.size:
+            # Samples after the last whole frame belong to the final segment
+            start, end, confidence = result[-1]
+            result[-1] = (start, end + self.carry.size / self.sample_rate, confidence)
+        return result
+
+
+def segment_blocks(blocks: Iterable[np.ndarray], sample_rate: int, **options) -> List[tuple]:
+    segmenter = EnergySegmenter(sample_rate, **options)
+    for block in blocks:
+        segmenter.feed(block)
+    return segmenter.finish()
+
+
+def split_recording(file_path: str, filename: str, **options) -> Optional[List[tuple]]:
+    """Segment a recording on disk, or return None when it cannot be decoded here"""
+    from app.audio.pcm import open_audio_blocks
+    
+    opened = open_audio_blocks(file_path, filename)
+    if opened is None:
+        return None
+    sample_rate, blocks = opened
+    return segment_blocks(blocks, sample_rate, **options)
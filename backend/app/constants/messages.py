@@ -1,7 +1,12 @@
 class ErrorMessages:
     INVALID_CREDENTIALS = "Invalid credentials"
     ACCOUNT_DEACTIVATED = "Account is deactivated"
+    LOGIN_BUSY = "Too many logins in progress, please retry shortly"
+    PASSWORD_BUSY = "Too many password changes in progress, please retry shortly"
     INVALID_TOKEN = "Invalid token"
+    INVALID_CURSOR = "Invalid pagination cursor"
+    UNKNOWN_FIELDS = "Unknown fields"
+    UNSUPPORTED_EXPORT_FORMAT = "Unsupported export format"
     USER_NOT_FOUND = "User not found"
     INSUFFICIENT_PERMISSIONS = "Not enough permissions"
     NOT_FOUND = "Resource not found"
@@ -17,6 +22,16 @@ class ErrorMessages:
     NO_PERMISSION_PROJECT = "You don't have permission to access this project"
     NO_PERMISSION_FOLDER = "You don't have permission to access this folder"
     NO_PERMISSION_SEGMENT = "You don't have permission to access this segment"
+    WAVEFORM_NOT_AVAILABLE = "Waveform is not available for this segment"
+    INVALID_AUDIO_SIGNATURE = "Audio link is invalid or has expired"
+    AUDIO_FILE_NOT_FOUND = "Audio file not found"
+    UPLOAD_NOT_FOUND = "Upload not found"
+    UPLOAD_TOO_LARGE = "Upload exceeds the maximum allowed size"
+    UPLOAD_OFFSET_MISMATCH = "Upload offset does not match the current offset"
+    UPLOAD_INCOMPLETE = "Upload is not complete"
+    UPLOAD_ALREADY_COMPLETED = "Upload has already been completed"
+    UPLOAD_IN_PROGRESS = "Another request is already writing to this upload"
+    INGESTION_ABANDONED = "Ingestion stopped during its final attempt"
 
 class SuccessMessages:
     LOGIN_SUCCESS = "Login successful"
@@ -31,3 +46,4 @@ class SuccessMessages:
     FOLDER_DELETED = "Folder deleted successfully"
     SEGMENT_DELETED = "Segment removed successfully"
     SEGMENTS_REORDERED = "Segments reordered successfully"
+    UPLOAD_CANCELLED = "Upload cancelled successfully"
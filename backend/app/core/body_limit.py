@@ -0,0 +1,56 @@
+"""Cap the size of multipart upload requests before any of the body is spooled.
+
+FastAPI parses a multipart form completely, spooling every file to disk,
+before an endpoint runs, so per-file limits applied while copying files out
+of UploadFile only fire after the whole request has arrived. This middleware
+answers 413 straight from Content-Length when the declared body is too large,
+and otherwise counts the bytes as the form parser pulls them, failing the
+parse as soon as the count passes the limit.
+"""
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.constants import ErrorMessages
+
+
+class MultipartSizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.max_body_size:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(
+                {"detail": ErrorMessages.UPLOAD_TOO_LARGE},
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                headers={"Connection": "close"}
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised inside request.form(); FastAPI passes HTTPException through as is
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=ErrorMessages.UPLOAD_TOO_LARGE
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,56 @@
+"""Validators and 304 handling for conditional GET requests."""
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Headers a 304 must repeat from the 200 it stands in for
+NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "etag", "expires", "last-modified", "vary")
+
+
+def content_etag(content: bytes) -> str:
+    """Strong ETag for an in-memory representation"""
+    return '"' + hashlib.sha1(content).hexdigest() + '"'
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against the current ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[float]) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since only when it is absent"""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: dict) -> Response:
+    kept = {key: value for key, value in headers.items() if key.lower() in NOT_MODIFIED_HEADERS}
+    return Response(status_code=304, headers=kept)
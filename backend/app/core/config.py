@@ -10,6 +10,13 @@ class Settings(BaseSettings):
     JWT_SECRET: str = "your-super-secret-jwt-key-change-in-production"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 1440  # 24 hours
+    PRINCIPAL_CACHE_TTL: float = 30.0  # seconds a resolved user is reused, 0 disables
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    BCRYPT_ROUNDS: int = 12  # stored hashes with a lower cost are upgraded on the next login
+    PASSWORD_HASH_WORKERS: int = 0  # threads reserved for bcrypt, 0 for half the CPU cores
+    PASSWORD_HASH_QUEUE_SIZE: int = 256  # hashes allowed to wait for a worker before logins get 503
+    PASSWORD_HASH_TIMEOUT: float = 15.0  # seconds a login may wait for its hash; longer queues get 503 up front
+    PASSWORD_HASH_NICENESS: int = 10  # scheduling priority of hashing threads on Linux
     
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
@@ -17,6 +24,50 @@ class Settings(BaseSettings):
     # File uploads
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
+    MAX_UPLOAD_REQUEST_SIZE: int = 1024 * 1024 * 1024  # 1GB per multipart request, refused before it is spooled
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1MB
+    BLOB_LEASE_SECONDS: int = 15 * 60  # blobs an upload touched this recently are never released
+    MAX_RESUMABLE_FILE_SIZE: int = 4 * 1024 * 1024 * 1024  # 4GB
+    METADATA_PROBE_WORKERS: int = 4
+    METADATA_PROBE_EXECUTOR: str = "thread"  # thread or process
+    
+    # Automatic segmentation of long recordings at pauses
+    AUTO_SEGMENT_ENABLED: bool = True
+    AUTO_SEGMENT_MIN_DURATION: float = 60.0  # shorter recordings stay one segment
+    AUTO_SEGMENT_MIN_LENGTH: float = 5.0
+    AUTO_SEGMENT_MAX_LENGTH: float = 30.0
+    AUTO_SEGMENT_MIN_PAUSE: float = 0.5
+    
+    # Waveform peaks sidecars written at ingest
+    WAVEFORM_PEAKS_ENABLED: bool = True
+    
+    # Audio delivery
+    AUDIO_STREAM_CHUNK_SIZE: int = 64 * 1024  # 64KB
+    AUDIO_ETAG_CACHE_SIZE: int = 4096
+    AUDIO_ETAG_CACHE_TTL: float = 30.0  # seconds before a file is stat'ed again
+    AUDIO_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB per process, 0 disables
+    AUDIO_CACHE_MAX_ITEM_SIZE: int = 4 * 1024 * 1024  # larger bodies always stream from disk
+    BUNDLE_MAX_SEGMENTS: int = 20
+    SIGNED_AUDIO_URLS: bool = True  # put signed /audio links in fileUrl of stored files
+    AUDIO_URL_SECRET: Optional[str] = None  # defaults to JWT_SECRET
+    AUDIO_URL_TTL: int = 15 * 60
+    
+    # List pagination
+    SEGMENT_PAGE_SIZE: int = 100  # page size when a cursor is sent without a limit
+    SEGMENT_PAGE_MAX_SIZE: int = 1000
+    PROJECT_PAGE_SIZE: int = 50
+    PROJECT_PAGE_MAX_SIZE: int = 500
+    USER_PAGE_SIZE: int = 100  # the user listing always pages, starting with this many
+    USER_PAGE_MAX_SIZE: int = 1000
+    
+    # Transcript exports
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched from the database cursor at a time
+    EXPORT_CHUNK_SIZE: int = 64 * 1024  # bytes buffered before a chunk is sent
+    
+    # Ingestion
+    INGESTION_MODE: str = "queue"  # queue (worker.py) or sync (inside the request)
+    INGESTION_POLL_INTERVAL: float = 2.0
+    INGESTION_STALE_SECONDS: int = 15 * 60  # reclaim items from workers that died mid-run
     
     class Config:
         env_file = ".env"
@@ -15,3 +15,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input; pair with ``escape="\\\\"``"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
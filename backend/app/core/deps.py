@@ -2,9 +2,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.config import settings
 from app.core.security import verify_token
-from app.models.user import User
-from app.crud.user import get_user_by_id
+from app.core.principals import Principal, principal_cache
+from app.crud.user import get_user_by_id, get_user_language_ids
 from app.constants import ErrorMessages
 
 security = HTTPBearer()
@@ -13,8 +14,13 @@ security = HTTPBearer()
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     token = credentials.credentials
+    use_cache = settings.PRINCIPAL_CACHE_TTL > 0
+    principal = principal_cache.get(token) if use_cache else None
+    if principal is not None:
+        return principal
+    
     payload = verify_token(token)
     
     if payload is None:
@@ -47,14 +53,23 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        is_active=user.is_active,
+        language_ids=tuple(get_user_language_ids(db, user))
+    )
+    if use_cache:
+        principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def get_current_manager_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_manager_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -62,7 +77,7 @@ def get_current_manager_user(current_user: User = Depends(get_current_user)) ->
         )
     return current_user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,33 @@
+import threading
+from typing import Callable, Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def increment(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def get_counter(name: str) -> int:
+    return _counters.get(name, 0)
+
+
+def ratio(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator else 0.0
+
+
+def register_stats_provider(name: str, provider: Callable[[], dict]) -> None:
+    """Register a callable whose dict is reported under ``name`` by collect_metrics"""
+    _providers[name] = provider
+
+
+def collect_metrics() -> dict:
+    with _lock:
+        counters = dict(_counters)
+    return {
+        "counters": counters,
+        **{name: provider() for name, provider in _providers.items()}
+    }
@@ -0,0 +1,40 @@
+"""Opaque keyset cursors for list endpoints.
+
+A cursor carries the sort key of the last row a client received; the next
+page continues strictly after it, so pages stay stable while rows are added
+or edited and never need an OFFSET scan. Paginated lists keep their plain
+JSON array body and report the following page in the X-Next-Cursor header.
+"""
+import base64
+import json
+from typing import Optional, Sequence
+from app.constants import ErrorMessages
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> tuple:
+    """Decode a cursor into a tuple matching ``types``, raising ValueError when it is malformed"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise ValueError(ErrorMessages.INVALID_CURSOR)
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(ErrorMessages.INVALID_CURSOR)
+    if not all(isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types)):
+        raise ValueError(ErrorMessages.INVALID_CURSOR)
+    return tuple(values)
+
+
+def next_cursor(rows: list, limit: Optional[int], key) -> Optional[str]:
+    """Trim a ``limit + 1`` fetch to ``limit`` rows and return the cursor after the last one kept"""
+    if limit is None or len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(key(rows[-1]))
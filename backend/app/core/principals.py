@@ -0,0 +1,103 @@
+"""Per-process TTL cache of authenticated principals.
+
+``get_current_user`` resolves a bearer token to a Principal holding what
+authorization needs (role, active flag, language IDs), so repeat requests
+skip the JWT decode and user/language queries. Entries are indexed by user
+ID and dropped whenever that user or their language assignments change in
+this process; other processes see the change once the TTL runs out.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from app.core.config import settings
+from app.core import metrics
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: str
+    username: str
+    role: str
+    is_active: bool
+    language_ids: Tuple[int, ...]
+
+
+class PrincipalCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple] = {}
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Principal]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] <= now:
+                self._remove(token)
+                entry = None
+        if entry is None:
+            metrics.increment("principal_cache.misses")
+            return None
+        metrics.increment("principal_cache.hits")
+        return entry[1]
+
+    def put(self, token: str, principal: Principal, token_expires: Optional[float] = None) -> None:
+        # Never outlive the token itself
+        expires = time.time() + self.ttl
+        if token_expires is not None:
+            expires = min(expires, token_expires)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict_expired()
+            if len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+            self._entries[token] = (expires, principal)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for token in self._tokens_by_user.pop(user_id, set()):
+                self._entries.pop(token, None)
+        metrics.increment("principal_cache.invalidations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[1].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[1].id]
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for token in [token for token, entry in self._entries.items() if entry[0] <= now]:
+            self._remove(token)
+
+    def stats(self) -> dict:
+        hits = metrics.get_counter("principal_cache.hits")
+        misses = metrics.get_counter("principal_cache.misses")
+        return {
+            "entries": len(self._entries),
+            "hits": hits,
+            "misses": misses,
+            "hitRatio": metrics.ratio(hits, hits + misses),
+            "invalidations": metrics.get_counter("principal_cache.invalidations"),
+        }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL, settings.PRINCIPAL_CACHE_SIZE)
+metrics.register_stats_provider("principalCache", principal_cache.stats)
+
+
+def invalidate_principal(user_id: str) -> None:
+    principal_cache.invalidate_user(user_id)
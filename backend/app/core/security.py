@@ -1,10 +1,11 @@
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.core.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.passwords import password_hasher
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -27,12 +28,34 @@ def verify_token(token: str) -> Optional[dict]:
 
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
-    # Handle simple hash for testing (admin user)
-    if password_hash == 'admin_hash_123' and plain_password == 'admin':
-        return True
-    return pwd_context.verify(plain_password, password_hash)
+    # The seeded admin's placeholder hash is handled by the hasher
+    matches, _ = password_hasher.verify(plain_password, password_hash)
+    return matches
 
 
 def get_password_hash(password: str) -> str:
     truncated_password = password[:72]
-    return pwd_context.hash(truncated_password)
+    return password_hasher.hash(truncated_password)
+
+
+def _audio_signature(file_name: str, expires: int, window: str) -> str:
+    secret = (settings.AUDIO_URL_SECRET or settings.JWT_SECRET).encode()
+    message = f"{file_name}\n{expires}\n{window}".encode()
+    return hmac.new(secret, message, hashlib.sha256).hexdigest()
+
+
+def sign_audio_url(file_name: str, window: str = "") -> tuple:
+    """Return (expires, signature) for a blob file name and optional clip window.
+
+    Expiry is rounded up to the next TTL boundary so the URL, and with it the
+    browser cache entry, stays the same for a whole TTL period.
+    """
+    ttl = settings.AUDIO_URL_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return expires, _audio_signature(file_name, expires, window)
+
+
+def verify_audio_signature(file_name: str, expires: int, window: str, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_audio_signature(file_name, expires, window), signature)
@@ -0,0 +1,19 @@
+"""JSON encoding for list endpoints that skips Pydantic.
+
+Lists are rendered straight from ORM objects or Row tuples to JSON bytes
+with orjson, which encodes datetimes natively in the same ISO 8601 form as
+``isoformat()``. The endpoints still declare their response_model for the
+API docs, but return the bytes in a Response, so FastAPI does not validate
+and re-encode every item a second time.
+"""
+from typing import Any, Dict, Optional
+import orjson
+from fastapi import Response
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,196 @@
+"""Ranged, streamed file responses.
+
+Bodies are never read into memory as a whole: they are sent either through
+the ASGI ``http.response.zerocopysend`` extension, which lets servers that
+implement it hand the file descriptor to ``os.sendfile``, or in fixed-size
+chunks read off the event loop.
+"""
+import os
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.conditional import http_date
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str, size: int) -> Optional[tuple]:
+    """Parse a single-range ``Range`` header into an inclusive (start, end) pair.
+
+    Returns None when the header should be ignored (other units, several
+    ranges or bad syntax) and raises RangeNotSatisfiable when the range lies
+    outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    
+    try:
+        if not first:
+            # Suffix range: the final N bytes
+            suffix = int(last)
+            if suffix <= 0 or not size:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(value: str, etag: Optional[str], last_modified: float) -> bool:
+    """Whether an ``If-Range`` validator still describes the current file"""
+    value = value.strip()
+    if value.startswith('"') or value.startswith("W/"):
+        # Only strong validators may be used for ranges
+        return etag is not None and value == etag
+    try:
+        return int(parsedate_to_datetime(value).timestamp()) == int(last_modified)
+    except (TypeError, ValueError):
+        return False
+
+
+class FileRangeResponse(Response):
+    """Send ``prefix`` followed by ``length`` bytes of a file starting at ``offset``"""
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        prefix: bytes = b""
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.prefix = prefix
+        self.chunk_size = chunk_size or settings.AUDIO_STREAM_CHUNK_SIZE
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(len(prefix) + length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if not self.length:
+            await send({"type": "http.response.body", "body": self.prefix, "more_body": False})
+            return
+        
+        if self.prefix:
+            await send({"type": "http.response.body", "body": self.prefix, "more_body": True})
+        
+        if ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": ZERO_COPY_EXTENSION,
+                    "file": f.fileno(),
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+        
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                # The file shrank underneath us; close the body rather than hang
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def ranged_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    headers: Optional[dict] = None,
+    etag: Optional[str] = None,
+    file_size: Optional[int] = None,
+    last_modified: Optional[float] = None,
+    clip: Optional[tuple] = None,
+    content: Optional[bytes] = None
+) -> Response:
+    """Build a 200, 206 or 416 response for a file honoring Range and If-Range.
+
+    ``clip`` is an optional (prefix, offset, length) body made of a header and
+    part of the file (see ``app.audio.clips``); ranges then address that body.
+    ``content`` is the complete body already held in memory, which is then
+    sliced instead of reading the file.
+    Callers that already know the file size and mtime pass them to skip the stat.
+    """
+    if file_size is None or last_modified is None:
+        stat_result = os.stat(path)
+        file_size, last_modified = stat_result.st_size, stat_result.st_mtime
+    prefix, offset, length = clip or (b"", 0, file_size)
+    size = len(content) if content is not None else len(prefix) + length
+    
+    headers = dict(headers or {})
+    headers["Accept-Ranges"] = "bytes"
+    headers["Last-Modified"] = http_date(last_modified)
+    if etag:
+        headers["ETag"] = etag
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range_matches(if_range, etag, last_modified)):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            if content is not None:
+                return Response(content[start:end + 1], 206, headers, media_type)
+            # Split the range between the in-memory prefix and the file bytes after it
+            file_start = max(start - len(prefix), 0)
+            file_length = max(end + 1 - len(prefix), 0) - file_start
+            return FileRangeResponse(
+                path, offset + file_start, file_length, 206, headers, media_type,
+                prefix=prefix[start:end + 1]
+            )
+    
+    if content is not None:
+        return Response(content, 200, headers, media_type)
+    return FileRangeResponse(path, offset, length, 200, headers, media_type, prefix=prefix)
@@ -1,20 +1,36 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ..models.project import Folder
+from ..models.project import Folder, Project
 from ..schemas.folder import FolderCreate, FolderUpdate
 
 
-def get_folders(db: Session, project_id: int) -> List[Folder]:
-    return db.query(Folder).filter(Folder.project_id == project_id).order_by(Folder.created_at).all()
+def get_folders(
+    db: Session,
+    project_id: int,
+    language_ids: Optional[List[int]] = None,
+    columns: Optional[List[str]] = None
+) -> List[Folder]:
+    """A project's folders, or Row tuples of just ``columns`` when given"""
+    if columns is None:
+        query = db.query(Folder)
+    else:
+        query = db.query(*(getattr(Folder, column) for column in columns))
+    query = query.filter(Folder.project_id == project_id)
+    if language_ids is not None:
+        query = query.join(Project, Project.id == Folder.project_id).filter(Project.language_id.in_(language_ids))
+    return query.order_by(Folder.created_at).all()
 
 
 def get_folder(db: Session, folder_id: int) -> Optional[Folder]:
     return db.query(Folder).filter(Folder.id == folder_id).first()
 
 
-def create_folder(db: Session, folder: FolderCreate) -> Folder:
+def create_folder(db: Session, folder: FolderCreate, commit: bool = True) -> Folder:
     db_folder = Folder(**folder.dict())
     db.add(db_folder)
+    if not commit:
+        db.flush()
+        return db_folder
     db.commit()
     db.refresh(db_folder)
     return db_folder
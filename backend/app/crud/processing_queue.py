@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_
+from typing import List, Optional
+from ..models.processing_queue import ProcessingQueue
+from ..constants import ProcessingStatus
+
+
+def enqueue_ingestion(db: Session, project, folder, stored_files: List) -> ProcessingQueue:
+    payload = {
+        "folder_id": folder.id,
+        "files": [stored_file.dict() for stored_file in stored_files]
+    }
+    item = ProcessingQueue(
+        project_id=project.id,
+        status=ProcessingStatus.PENDING.value,
+        payload=json.dumps(payload)
+    )
+    db.add(item)
+    db.flush()
+    return item
+
+
+def claim_next_queue_item(db: Session, stale_after_seconds: int) -> Optional[ProcessingQueue]:
+    """Atomically take the oldest runnable item, including ones abandoned by a dead worker"""
+    stale_before = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    item = db.query(ProcessingQueue).filter(
+        ProcessingQueue.attempts < ProcessingQueue.max_attempts,
+        or_(
+            ProcessingQueue.status == ProcessingStatus.PENDING.value,
+            and_(
+                ProcessingQueue.status == ProcessingStatus.PROCESSING.value,
+                ProcessingQueue.updated_at < stale_before
+            )
+        )
+    ).order_by(ProcessingQueue.id).with_for_update(skip_locked=True).first()
+    
+    if not item:
+        db.commit()
+        return None
+    
+    item.status = ProcessingStatus.PROCESSING.value
+    item.attempts += 1
+    item.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(item)
+    return item
+
+
+def claim_abandoned_queue_items(db: Session, stale_after_seconds: int) -> List[ProcessingQueue]:
+    """Lock items a dead worker left PROCESSING after their final attempt; they will never be claimed again"""
+    stale_before = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    return db.query(ProcessingQueue).filter(
+        ProcessingQueue.status == ProcessingStatus.PROCESSING.value,
+        ProcessingQueue.attempts >= ProcessingQueue.max_attempts,
+        ProcessingQueue.updated_at < stale_before
+    ).order_by(ProcessingQueue.id).with_for_update(skip_locked=True).all()
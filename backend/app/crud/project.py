@@ -1,33 +1,84 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, tuple_
 from typing import List, Optional
 from ..models.project import Project
 from ..models.segment import Segment
 from ..schemas.project import ProjectCreate, ProjectUpdate
+from ..core.database import escape_like
 
 
-def get_projects(db: Session, user_id: Optional[str] = None, language_ids: Optional[List[int]] = None) -> List[Project]:
-    query = db.query(Project)
+# Sort keys of the project listing; every one is paired with id so keyset positions are unique
+PROJECT_SORT_COLUMNS = {
+    "createdAt": Project.created_at,
+    "updatedAt": Project.updated_at,
+    "name": Project.name,
+}
+
+
+def get_projects(
+    db: Session,
+    user_id: Optional[str] = None,
+    language_ids: Optional[List[int]] = None,
+    filters: Optional[dict] = None,
+    name_prefix: Optional[str] = None,
+    sort: str = "-createdAt",
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None
+) -> List[Project]:
+    """Projects matching the filters in ``sort`` order, optionally a keyset page after ``after``.
+
+    ``sort`` is a key of PROJECT_SORT_COLUMNS, prefixed with ``-`` for descending.
+    ``limit`` fetches one extra row so callers can tell whether another page follows.
+    With ``columns`` the result is Row tuples of just those columns instead of Project objects.
+    """
+    if columns is None:
+        query = db.query(Project)
+    else:
+        query = db.query(*(getattr(Project, column) for column in columns))
     
     conditions = []
     if user_id:
         conditions.append(Project.user_id == user_id)
     if language_ids:
         conditions.append(Project.language_id.in_(language_ids))
+    for field, value in (filters or {}).items():
+        if value is not None:
+            conditions.append(getattr(Project, field) == value)
+    if name_prefix:
+        # The range lets the name index seek to the prefix; LIKE keeps the match exact
+        conditions.append(Project.name >= name_prefix)
+        conditions.append(Project.name < name_prefix + "\U0010ffff")
+        conditions.append(Project.name.like(escape_like(name_prefix) + "%", escape="\\"))
+    
+    descending = sort.startswith("-")
+    column = PROJECT_SORT_COLUMNS[sort.lstrip("-")]
+    if after is not None:
+        position = tuple_(column, Project.id)
+        conditions.append(position < tuple_(*after) if descending else position > tuple_(*after))
     
     if conditions:
         query = query.filter(and_(*conditions))
     
-    return query.order_by(Project.created_at.desc()).all()
+    if descending:
+        query = query.order_by(column.desc(), Project.id.desc())
+    else:
+        query = query.order_by(column, Project.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query.all()
 
 
 def get_project(db: Session, project_id: int) -> Optional[Project]:
     return db.query(Project).filter(Project.id == project_id).first()
 
 
-def create_project(db: Session, project: ProjectCreate) -> Project:
+def create_project(db: Session, project: ProjectCreate, commit: bool = True) -> Project:
     db_project = Project(**project.dict())
     db.add(db_project)
+    if not commit:
+        db.flush()
+        return db_project
     db.commit()
     db.refresh(db_project)
     return db_project
@@ -59,6 +110,12 @@ def delete_project(db: Session, project_id: int) -> bool:
     from ..models.project import Folder
     db.query(Folder).filter(Folder.project_id == project_id).delete()
     
+    # Delete queued ingestion work and detach finished resumable uploads
+    from ..models.processing_queue import ProcessingQueue
+    from ..models.upload_session import UploadSession
+    db.query(ProcessingQueue).filter(ProcessingQueue.project_id == project_id).delete()
+    db.query(UploadSession).filter(UploadSession.project_id == project_id).update({"project_id": None})
+    
     # Delete the project
     db.delete(db_project)
     db.commit()
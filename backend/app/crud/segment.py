@@ -1,15 +1,98 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import insert, func, tuple_
+from typing import Iterator, List, Optional
 from ..models.segment import Segment
+from ..models.project import Project
 from ..schemas.segment import SegmentCreate, SegmentUpdate
 
 
-def get_segments(db: Session, project_id: int) -> List[Segment]:
-    return db.query(Segment).filter(Segment.project_id == project_id).order_by(Segment.segment_number).all()
+def _scoped(query, language_ids: Optional[List[int]]):
+    """Restrict segments to projects in ``language_ids`` with a join; None leaves them unrestricted"""
+    if language_ids is None:
+        return query
+    return query.join(Project, Project.id == Segment.project_id).filter(Project.language_id.in_(language_ids))
 
 
-def get_segments_by_folder(db: Session, folder_id: int) -> List[Segment]:
-    return db.query(Segment).filter(Segment.folder_id == folder_id).order_by(Segment.segment_number).all()
+def _select(db: Session, columns: Optional[List[str]]):
+    """Query Segment objects, or Row tuples of just ``columns`` when given"""
+    if columns is None:
+        return db.query(Segment)
+    return db.query(*(getattr(Segment, column) for column in columns))
+
+
+def _page(query, after: Optional[tuple], limit: Optional[int], filters: Optional[dict]):
+    """Apply equality filters and a keyset window on (segment_number, id) to a segment query"""
+    for field, value in (filters or {}).items():
+        if value is not None:
+            query = query.filter(getattr(Segment, field) == value)
+    if after is not None:
+        query = query.filter(tuple_(Segment.segment_number, Segment.id) > tuple_(*after))
+    query = query.order_by(Segment.segment_number, Segment.id)
+    if limit is not None:
+        # One extra row tells the caller whether another page follows
+        query = query.limit(limit + 1)
+    return query
+
+
+def get_segments(
+    db: Session,
+    project_id: int,
+    language_ids: Optional[List[int]] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    filters: Optional[dict] = None,
+    columns: Optional[List[str]] = None
+) -> List[Segment]:
+    query = _scoped(_select(db, columns).filter(Segment.project_id == project_id), language_ids)
+    return _page(query, after, limit, filters).all()
+
+
+def get_segments_by_folder(
+    db: Session,
+    folder_id: int,
+    language_ids: Optional[List[int]] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    filters: Optional[dict] = None,
+    columns: Optional[List[str]] = None
+) -> List[Segment]:
+    query = _scoped(_select(db, columns).filter(Segment.folder_id == folder_id), language_ids)
+    return _page(query, after, limit, filters).all()
+
+
+def get_segments_from(db: Session, folder_id: int, segment_number: int, limit: int) -> List[Segment]:
+    """The ``limit`` segments of a folder starting at ``segment_number``, in order"""
+    return (
+        db.query(Segment)
+        .filter(Segment.folder_id == folder_id, Segment.segment_number >= segment_number)
+        .order_by(Segment.segment_number, Segment.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def iter_segment_rows(
+    db: Session,
+    columns: List[str],
+    project_id: Optional[int] = None,
+    folder_id: Optional[int] = None,
+    batch_size: int = 1000
+) -> Iterator[tuple]:
+    """Stream Row tuples of ``columns`` for a project's or folder's segments, folder by folder in order.
+
+    ``yield_per`` fetches through a server-side cursor where the driver has one,
+    so only ``batch_size`` rows are held at a time however large the result.
+    """
+    query = db.query(*(getattr(Segment, column) for column in columns))
+    if project_id is not None:
+        query = query.filter(Segment.project_id == project_id)
+    if folder_id is not None:
+        query = query.filter(Segment.folder_id == folder_id)
+    return iter(query.order_by(Segment.folder_id, Segment.segment_number, Segment.id).yield_per(batch_size))
+
+
+def get_max_segment_number(db: Session, folder_id: int) -> int:
+    return db.query(func.max(Segment.segment_number)).filter(Segment.folder_id == folder_id).scalar() or 0
 
 
 def get_segment(db: Session, segment_id: int) -> Optional[Segment]:
@@ -24,6 +107,17 @@ def create_segment(db: Session, segment: SegmentCreate) -> Segment:
     return db_segment
 
 
+def bulk_create_segments(db: Session, segments: List[SegmentCreate], commit: bool = True) -> int:
+    """Insert all segments with a single multi-row INSERT instead of one round trip each"""
+    if not segments:
+        return 0
+    
+    db.execute(insert(Segment), [segment.dict() for segment in segments])
+    if commit:
+        db.commit()
+    return len(segments)
+
+
 def update_segment(db: Session, segment_id: int, segment_update: SegmentUpdate) -> Optional[Segment]:
     db_segment = get_segment(db, segment_id)
     if not db_segment:
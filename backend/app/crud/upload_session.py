@@ -0,0 +1,34 @@
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..models.upload_session import UploadSession
+
+
+def get_upload_session(
+    db: Session, upload_id: str, user_id: Optional[str] = None, lock: bool = False
+) -> Optional[UploadSession]:
+    """Load an upload session; with ``lock``, row-lock it until commit, returning None if another transaction holds it"""
+    query = db.query(UploadSession).filter(UploadSession.id == upload_id)
+    if user_id:
+        query = query.filter(UploadSession.user_id == user_id)
+    if lock:
+        query = query.with_for_update(skip_locked=True)
+    return query.first()
+
+
+def create_upload_session(db: Session, upload_session: UploadSession) -> UploadSession:
+    db.add(upload_session)
+    db.commit()
+    db.refresh(upload_session)
+    return upload_session
+
+
+def update_upload_offset(db: Session, upload_session: UploadSession, upload_offset: int) -> UploadSession:
+    upload_session.upload_offset = upload_offset
+    db.commit()
+    db.refresh(upload_session)
+    return upload_session
+
+
+def delete_upload_session(db: Session, upload_session: UploadSession) -> None:
+    db.delete(upload_session)
+    db.commit()
@@ -1,10 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
 from typing import Optional, List
 from ..models.user import User
 from ..models.language import UserLanguage
 from ..schemas.user import UserCreate, UserUpdate
 from ..core.security import get_password_hash, verify_password
+from ..core.principals import invalidate_principal
+from ..core.database import escape_like
 
 
 def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
@@ -25,8 +27,39 @@ def get_user_by_username_or_email(db: Session, username_or_email: str) -> Option
     ).first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users(
+    db: Session,
+    search: Optional[str] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    after: Optional[str] = None,
+    limit: int = 100
+) -> List[User]:
+    """Users in username order with their language assignments loaded.
+
+    Language assignments are joined onto the page of users, so a page costs a
+    single query however many users it holds. ``after`` is the username
+    of the previous page's last user; ``limit`` fetches one extra row so
+    callers can tell whether another page follows.
+    """
+    query = db.query(User).options(
+        joinedload(User.user_languages).joinedload(UserLanguage.language)
+    )
+    if search:
+        pattern = "%" + escape_like(search) + "%"
+        query = query.filter(or_(
+            User.username.ilike(pattern, escape="\\"),
+            User.email.ilike(pattern, escape="\\"),
+            User.first_name.ilike(pattern, escape="\\"),
+            User.last_name.ilike(pattern, escape="\\")
+        ))
+    if role:
+        query = query.filter(User.role == role)
+    if is_active is not None:
+        query = query.filter(User.is_active == is_active)
+    if after is not None:
+        query = query.filter(User.username > after)
+    return query.order_by(User.username).limit(limit + 1).all()
 
 
 def create_user(db: Session, user: UserCreate) -> User:
@@ -61,6 +94,7 @@ def update_user(db: Session, user_id: str, user_update: UserUpdate) -> Optional[
         setattr(db_user, field, value)
     
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -74,8 +108,7 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     return user
 
 
-def get_user_languages(db: Session, user_id: str) -> List[dict]:
-    user_languages = db.query(UserLanguage).filter(UserLanguage.user_id == user_id).all()
+def user_languages_to_dicts(user_languages: List[UserLanguage]) -> List[dict]:
     return [
         {
             "id": ul.language_id,
@@ -86,10 +119,32 @@ def get_user_languages(db: Session, user_id: str) -> List[dict]:
     ]
 
 
+def get_user_languages(db: Session, user_id: str) -> List[dict]:
+    user_languages = (
+        db.query(UserLanguage)
+        .options(joinedload(UserLanguage.language))
+        .filter(UserLanguage.user_id == user_id)
+        .all()
+    )
+    return user_languages_to_dicts(user_languages)
+
+
+def get_user_language_ids(db: Session, user) -> List[int]:
+    """Language IDs a user may access, taken from the cached principal when there is one"""
+    cached = getattr(user, "language_ids", None)
+    if cached is not None:
+        return list(cached)
+    return [
+        row.language_id
+        for row in db.query(UserLanguage.language_id).filter(UserLanguage.user_id == user.id)
+    ]
+
+
 def assign_user_language(db: Session, user_id: str, language_id: int) -> UserLanguage:
     user_language = UserLanguage(user_id=user_id, language_id=language_id)
     db.add(user_language)
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(user_language)
     return user_language
 
@@ -102,6 +157,7 @@ def remove_user_language(db: Session, user_id: str, language_id: int) -> bool:
     if user_language:
         db.delete(user_language)
         db.commit()
+        invalidate_principal(user_id)
         return True
     return False
 
@@ -113,6 +169,7 @@ def deactivate_user(db: Session, user_id: str) -> Optional[User]:
     
     db_user.is_active = False
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -128,6 +185,7 @@ def delete_user(db: Session, user_id: str) -> bool:
     # Delete the user
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id)
     return True
 
 
@@ -138,6 +196,7 @@ def reset_user_password(db: Session, user_id: str, new_password: str) -> Optiona
     
     db_user.password_hash = get_password_hash(new_password)
     db.commit()
+    invalidate_principal(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -1,10 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from app.core.config import settings
 from app.api.api_v1.api import api_router
 from app.core.database import Base, engine
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.body_limit import MultipartSizeLimitMiddleware
+from app.core.passwords import PasswordHasherBusy, password_hasher
+from app.constants import ErrorMessages
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
@@ -18,22 +23,35 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Added first so CORS wraps it and 413 replies still carry CORS headers
+app.add_middleware(MultipartSizeLimitMiddleware, max_body_size=settings.MAX_UPLOAD_REQUEST_SIZE)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # User creation, password resets and changes hash on the same bounded pool as logins
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": ErrorMessages.PASSWORD_BUSY},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 if os.path.exists("uploads"):
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    password_hasher.calibrate()
 
 @app.get("/")
 async def read_root():
@@ -5,6 +5,7 @@ from .segment import Segment
 from .processing_queue import ProcessingQueue
 from .transcription import TranscriptionExample, TranscriptionCorrection
 from .session import Session
+from .upload_session import UploadSession
 
 __all__ = [
     "User",
@@ -17,5 +18,6 @@ __all__ = [
     "ProcessingQueue",
     "TranscriptionExample",
     "TranscriptionCorrection",
-    "Session"
+    "Session",
+    "UploadSession"
 ]
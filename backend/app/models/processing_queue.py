@@ -11,6 +11,7 @@ class ProcessingQueue(Base):
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     status = Column(String, nullable=False, default="pending")  # pending, processing, completed, failed
     error_message = Column(Text, nullable=True)
+    payload = Column(Text, nullable=True)  # JSON: folder_id and the stored files to ingest
     attempts = Column(Integer, nullable=False, default=0)
     max_attempts = Column(Integer, nullable=False, default=3)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
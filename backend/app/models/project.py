@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -12,7 +12,7 @@ class Project(Base):
     original_filename = Column(String(255), nullable=False)
     file_path = Column(Text, nullable=False)
     file_url = Column(Text, nullable=True)
-    file_key = Column(String(500), nullable=True)
+    file_key = Column(String(500), nullable=True, index=True)
     file_size = Column(Integer, nullable=True)
     mime_type = Column(String(100), nullable=True)
     duration = Column(Integer, nullable=False)
@@ -39,6 +39,18 @@ class Project(Base):
     user_projects = relationship("UserProject", back_populates="project")
     processing_queue = relationship("ProcessingQueue", back_populates="project")
 
+    # One index per sort key and per filter + default sort, so every listing page is a
+    # range scan that stops after ``limit`` rows instead of a sort over the whole table
+    __table_args__ = (
+        Index('IDX_project_created', 'created_at', 'id'),
+        Index('IDX_project_updated', 'updated_at', 'id'),
+        Index('IDX_project_name', 'name', 'id'),
+        Index('IDX_project_status_created', 'status', 'created_at', 'id'),
+        Index('IDX_project_language_created', 'language_id', 'created_at', 'id'),
+        Index('IDX_project_user_created', 'user_id', 'created_at', 'id'),
+        Index('IDX_project_domain_created', 'domain_type', 'created_at', 'id'),
+    )
+
 
 class Folder(Base):
     __tablename__ = "folders"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -13,7 +13,7 @@ class Segment(Base):
     original_filename = Column(String(255), nullable=False)
     file_path = Column(Text, nullable=False)
     file_url = Column(Text, nullable=True)
-    file_key = Column(String(500), nullable=True)
+    file_key = Column(String(500), nullable=True, index=True)
     file_size = Column(Integer, nullable=True)
     mime_type = Column(String(100), nullable=True)
     duration = Column(Float, nullable=False)
@@ -39,3 +39,10 @@ class Segment(Base):
     folder = relationship("Folder", back_populates="segments")
     transcriber = relationship("User", foreign_keys=[transcribed_by])
     translator = relationship("User", foreign_keys=[translated_by])
+
+    # Cover the keyset order of the segment list endpoints and of project exports
+    __table_args__ = (
+        Index('IDX_segment_folder_order', 'folder_id', 'segment_number', 'id'),
+        Index('IDX_segment_project_order', 'project_id', 'segment_number', 'id'),
+        Index('IDX_segment_project_export', 'project_id', 'folder_id', 'segment_number', 'id'),
+    )
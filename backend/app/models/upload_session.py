@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    filename = Column(String(255), nullable=False)
+    file_path = Column(Text, nullable=False)
+    upload_length = Column(BigInteger, nullable=False)
+    upload_offset = Column(BigInteger, nullable=False, default=0)
+    project_name = Column(String(200), nullable=True)
+    language_id = Column(Integer, ForeignKey("languages.id"), nullable=True)
+    status = Column(String, nullable=False, default="uploading")  # uploading, completed
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    user = relationship("User")
+    project = relationship("Project")
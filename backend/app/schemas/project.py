@@ -22,7 +22,8 @@ class ProjectBase(BaseModel):
 
 
 class ProjectCreate(ProjectBase):
-    pass
+    file_key: Optional[str] = None
+    file_size: Optional[int] = None
 
 
 class ProjectUpdate(BaseModel):
@@ -99,6 +99,16 @@ class SegmentResponse(BaseModel):
     createdAt: str
     updatedAt: str
 
+class PeaksResponse(BaseModel):
+    sampleRate: int
+    samplesPerPixel: int
+    zoom: int
+    zoomLevels: int
+    start: float
+    end: float
+    length: int
+    data: List[int]  # interleaved min/max pairs scaled to -128..127
+
 class AuthResponse(BaseModel):
     message: str
     token: str
@@ -114,5 +124,15 @@ class LanguageResponse(BaseModel):
     code: str
     isActive: bool
 
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    uploadLength: int
+    uploadOffset: int
+    status: str
+    projectId: Optional[int] = None
+    createdAt: str
+    updatedAt: str
+
 class MessageResponse(BaseModel):
     message: str
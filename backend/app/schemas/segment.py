@@ -23,7 +23,8 @@ class SegmentBase(BaseModel):
 
 
 class SegmentCreate(SegmentBase):
-    pass
+    file_key: Optional[str] = None
+    file_size: Optional[int] = None
 
 
 class SegmentUpdate(BaseModel):
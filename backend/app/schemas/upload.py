@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    upload_length: int
+    project_name: Optional[str] = None
+    language_id: Optional[int] = None
+
+
+class StoredFile(BaseModel):
+    filename: str
+    file_path: str
+    file_key: Optional[str] = None
+    file_size: Optional[int] = None
@@ -0,0 +1,61 @@
+from sqlalchemy import literal
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.models.user import User
+from app.models.project import Project, Folder
+from app.models.segment import Segment
+from app.crud.user import get_user_language_ids
+from app.constants import ErrorMessages, UserRole
+
+# Every read resolves the object, its project and the caller's language scope in one
+# statement: the scope is a predicate on the joined project instead of a second lookup.
+
+def language_scope(db: Session, user: User) -> Optional[List[int]]:
+    """Language ids a user is limited to, or None when their role sees every project"""
+    if user.role in [UserRole.ADMIN, UserRole.MANAGER]:
+        return None
+    return list(get_user_language_ids(db, user))
+
+def _allowed(scope: Optional[List[int]]):
+    if scope is None:
+        return literal(True).label("allowed")
+    return Project.language_id.in_(scope).label("allowed")
+
+def _check(row, scope: Optional[List[int]], not_found: str, denied: str):
+    if row is None:
+        raise ValueError(not_found)
+    obj, project_id, allowed = row
+    if scope is not None:
+        if project_id is None:
+            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
+        if not allowed:
+            raise ValueError(denied)
+    return obj
+
+def authorize_project(db: Session, project_id: int, user: User) -> Project:
+    """Load a project the user may see, raising the not-found or permission error otherwise"""
+    scope = language_scope(db, user)
+    row = db.query(Project, Project.id, _allowed(scope)).filter(Project.id == project_id).first()
+    return _check(row, scope, ErrorMessages.PROJECT_NOT_FOUND, ErrorMessages.NO_PERMISSION_PROJECT)
+
+def authorize_folder(db: Session, folder_id: int, user: User) -> Folder:
+    """Load a folder the user may see through its project's language"""
+    scope = language_scope(db, user)
+    row = (
+        db.query(Folder, Project.id, _allowed(scope))
+        .outerjoin(Project, Project.id == Folder.project_id)
+        .filter(Folder.id == folder_id)
+        .first()
+    )
+    return _check(row, scope, ErrorMessages.FOLDER_NOT_FOUND, ErrorMessages.NO_PERMISSION_FOLDER)
+
+def authorize_segment(db: Session, segment_id: int, user: User) -> Segment:
+    """Load a segment the user may see through its project's language"""
+    scope = language_scope(db, user)
+    row = (
+        db.query(Segment, Project.id, _allowed(scope))
+        .outerjoin(Project, Project.id == Segment.project_id)
+        .filter(Segment.id == segment_id)
+        .first()
+    )
+    return _check(row, scope, ErrorMessages.SEGMENT_NOT_FOUND, ErrorMessages.NO_PERMISSION_SEGMENT)
@@ -0,0 +1,299 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, NamedTuple, Optional
+from starlette.requests import Request
+from starlette.responses import Response
+from app.models.segment import Segment
+from app.audio.clips import plan_clip
+from app.core.config import settings
+from app.core import metrics
+from app.core.security import sign_audio_url
+from app.core.conditional import http_date, is_not_modified, not_modified_response
+from app.core.streaming import ranged_file_response
+
+MEDIA_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.ogg': 'audio/ogg',
+    '.flac': 'audio/flac'
+}
+
+
+class FileIdentity(NamedTuple):
+    size: int
+    mtime: float
+    etag: str
+
+
+class HotAudioCache:
+    """Byte-bounded LRU of complete response bodies keyed by ETag.
+
+    Only bodies up to ``max_item_bytes`` are admitted. The ETag changes with
+    the file's content (and clip window), so a changed file simply misses;
+    bodies of its older version are dropped as soon as a new one is stored.
+    """
+
+    def __init__(self, max_bytes: int, max_item_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.resident_bytes = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def admits(self, size: int) -> bool:
+        return 0 < size <= min(self.max_item_bytes, self.max_bytes)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                metrics.increment("audio_cache.misses")
+                return None
+            self._entries.move_to_end(key)
+        metrics.increment("audio_cache.hits")
+        return entry[2]
+
+    def put(self, key: str, file_path: str, version: str, content: bytes) -> None:
+        if not self.admits(len(content)):
+            return
+        with self._lock:
+            # Bodies cut from an older version of the file can never be served again
+            self._discard_path(file_path, keep_version=version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                # Two concurrent misses stored the same body; count it once
+                self.resident_bytes -= len(previous[2])
+            self._entries[key] = (file_path, version, content)
+            self.resident_bytes += len(content)
+            while self.resident_bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.resident_bytes -= len(evicted)
+                metrics.increment("audio_cache.evictions")
+
+    def _discard_path(self, file_path: str, keep_version: Optional[str] = None) -> None:
+        stale = [
+            key for key, (path, version, _) in self._entries.items()
+            if path == file_path and version != keep_version
+        ]
+        for key in stale:
+            self.resident_bytes -= len(self._entries.pop(key)[2])
+
+    def invalidate(self, file_path: str) -> None:
+        with self._lock:
+            self._discard_path(file_path)
+
+    def stats(self) -> dict:
+        hits = metrics.get_counter("audio_cache.hits")
+        misses = metrics.get_counter("audio_cache.misses")
+        return {
+            "entries": len(self._entries),
+            "residentBytes": self.resident_bytes,
+            "maxBytes": self.max_bytes,
+            "maxItemSize": self.max_item_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hitRatio": metrics.ratio(hits, hits + misses),
+            "evictions": metrics.get_counter("audio_cache.evictions"),
+        }
+
+
+_identity_lock = threading.Lock()
+_identity_cache: "OrderedDict[str, tuple]" = OrderedDict()
+hot_audio_cache = HotAudioCache(settings.AUDIO_CACHE_MAX_BYTES, settings.AUDIO_CACHE_MAX_ITEM_SIZE)
+metrics.register_stats_provider("audioCache", hot_audio_cache.stats)
+
+
+def get_media_type(file_path: str) -> str:
+    return MEDIA_TYPES.get(os.path.splitext(file_path)[1].lower(), 'audio/mpeg')
+
+
+def get_file_identity(file_path: str, file_key: Optional[str] = None) -> Optional[FileIdentity]:
+    """Size, mtime and strong ETag of a file, or None if it is missing.
+
+    Results are kept in a small LRU for AUDIO_ETAG_CACHE_TTL seconds so repeat
+    requests for a hot file neither stat nor hash it. Content-addressed blobs
+    use their digest as ETag; other files use inode, mtime and size.
+    """
+    now = time.monotonic()
+    with _identity_lock:
+        cached = _identity_cache.get(file_path)
+        if cached and cached[0] > now:
+            _identity_cache.move_to_end(file_path)
+            return cached[1]
+    
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        identity = None
+    else:
+        if file_key:
+            etag = f'"{file_key}"'
+        else:
+            etag = f'"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        identity = FileIdentity(stat_result.st_size, stat_result.st_mtime, etag)
+    
+    with _identity_lock:
+        _identity_cache[file_path] = (now + settings.AUDIO_ETAG_CACHE_TTL, identity)
+        _identity_cache.move_to_end(file_path)
+        while len(_identity_cache) > settings.AUDIO_ETAG_CACHE_SIZE:
+            _identity_cache.popitem(last=False)
+    return identity
+
+
+def forget_file_identity(file_path: str) -> None:
+    """Drop everything cached about a file that was removed or replaced"""
+    with _identity_lock:
+        _identity_cache.pop(file_path, None)
+    hot_audio_cache.invalidate(file_path)
+
+
+def is_clip_segment(segment: Segment) -> bool:
+    """Whether a segment covers only part of the recording it points at.
+
+    Only VAD splits share a file; other segments carry start and end times
+    that are positions in the folder, not offsets into their own file.
+    """
+    return segment.processing_method == 'vad_split'
+
+
+def segment_window(segment: Segment) -> Optional[tuple]:
+    """(start, end) seconds of the parent recording a clip segment covers, or None for the whole file"""
+    if not is_clip_segment(segment):
+        return None
+    return segment.start_time or 0.0, segment.end_time
+
+
+def format_window(window: Optional[tuple]) -> str:
+    if window is None:
+        return ""
+    start, end = window
+    return f"{start or 0:.3f}-{end or 0:.3f}"
+
+
+def parse_window(value: str) -> Optional[tuple]:
+    if not value:
+        return None
+    start, _, end = value.partition("-")
+    return float(start), float(end)
+
+
+def signed_file_url(file_path: Optional[str], file_key: Optional[str], window: Optional[tuple] = None) -> Optional[str]:
+    """Signed, expiring /audio link for a stored blob, or None when signing is off or the file is not a blob"""
+    if not settings.SIGNED_AUDIO_URLS or not file_path or not file_key:
+        return None
+    file_name = os.path.basename(file_path)
+    if not file_name.startswith(file_key):
+        return None
+    
+    window_value = format_window(window)
+    expires, signature = sign_audio_url(file_name, window_value)
+    url = f"/api/v1/audio/{file_name}?expires={expires}&signature={signature}"
+    if window_value:
+        url += f"&window={window_value}"
+    return url
+
+
+def segment_file_url(segment: Segment) -> Optional[str]:
+    return signed_file_url(segment.file_path, segment.file_key, segment_window(segment)) or segment.file_url
+
+
+def _read_body(file_path: str, clip: Optional[tuple], file_size: int) -> bytes:
+    prefix, offset, length = clip or (b"", 0, file_size)
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        return prefix + f.read(length)
+
+
+def _iter_body(file_path: str, clip: Optional[tuple], file_size: int) -> Iterator[bytes]:
+    prefix, offset, length = clip or (b"", 0, file_size)
+    if prefix:
+        yield prefix
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(settings.AUDIO_STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def window_etag(identity: FileIdentity, window: Optional[tuple]) -> str:
+    if window is None:
+        return identity.etag
+    # A clip is a different representation of the same file
+    return f'{identity.etag[:-1]}-{format_window(window)}"'
+
+
+def _load_body(file_path: str, identity: FileIdentity, window: Optional[tuple], etag: str) -> tuple:
+    """(content, clip) for a body: content is set when the body is or becomes cached.
+
+    Formats that cannot be cut without re-encoding fall back to the whole file.
+    """
+    content = hot_audio_cache.get(etag)
+    if content is not None:
+        return content, None
+    
+    clip = plan_clip(file_path, window[0], window[1]) if window else None
+    body_size = len(clip[0]) + clip[2] if clip else identity.size
+    if hot_audio_cache.admits(body_size):
+        content = _read_body(file_path, clip, identity.size)
+        hot_audio_cache.put(etag, file_path, identity.etag, content)
+    return content, clip
+
+
+def open_segment_body(segment: Segment, identity: FileIdentity) -> tuple:
+    """(size, chunk iterator) of a segment's audio body, from the hot cache when possible"""
+    window = segment_window(segment)
+    content, clip = _load_body(segment.file_path, identity, window, window_etag(identity, window))
+    if content is not None:
+        return len(content), iter((content,))
+    size = len(clip[0]) + clip[2] if clip else identity.size
+    return size, _iter_body(segment.file_path, clip, identity.size)
+
+
+def audio_response(
+    request: Request,
+    file_path: str,
+    identity: FileIdentity,
+    window: Optional[tuple],
+    filename: str,
+    cache_control: str = "public, max-age=3600"
+) -> Response:
+    """Stream audio, answering conditional requests with 304 before touching the file"""
+    etag = window_etag(identity, window)
+    headers = {
+        "Content-Disposition": f"inline; filename={filename}",
+        "Cache-Control": cache_control,
+        "ETag": etag,
+        "Last-Modified": http_date(identity.mtime)
+    }
+    if is_not_modified(request, etag, identity.mtime):
+        return not_modified_response(headers)
+    
+    # Replays of short segments come from memory; anything else streams from disk
+    content, clip = _load_body(file_path, identity, window, etag)
+    
+    # Honor Range so seeking only fetches what is needed. Segments cut from a
+    # longer recording get just their window, built on the fly
+    return ranged_file_response(
+        request,
+        file_path,
+        get_media_type(file_path),
+        headers=headers,
+        etag=etag,
+        file_size=identity.size,
+        last_modified=identity.mtime,
+        clip=clip,
+        content=content
+    )
+
+
+def segment_audio_response(request: Request, segment: Segment, identity: FileIdentity) -> Response:
+    return audio_response(
+        request, segment.file_path, identity, segment_window(segment), segment.original_filename
+    )
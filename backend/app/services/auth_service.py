@@ -1,8 +1,12 @@
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
-from app.crud.user import authenticate_user, get_user_by_id
+from app.crud.user import get_user_by_username_or_email, get_user_by_id
 from app.core.security import create_access_token, verify_password, get_password_hash, verify_token as verify_jwt_token
+from app.core.passwords import password_hasher
+from app.core import metrics
 from app.schemas.response import AuthResponse, TokenVerificationResponse, MessageResponse, UserResponse
 from app.constants import ErrorMessages, SuccessMessages
 
@@ -10,15 +14,42 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def login(self, username: str, password: str) -> AuthResponse:
-        user = authenticate_user(self.db, username, password)
-        if not user:
+    async def login(self, username: str, password: str) -> AuthResponse:
+        # Only the short database steps use the request threadpool; bcrypt runs on the
+        # hashing pool and the request holds neither a thread nor a connection while it waits
+        credentials = await run_in_threadpool(self._load_credentials, username)
+        if not credentials:
+            raise ValueError(ErrorMessages.INVALID_CREDENTIALS)
+        
+        user_id, password_hash, is_active = credentials
+        matches, upgraded_hash = await password_hasher.verify_async(password, password_hash)
+        if not matches:
             raise ValueError(ErrorMessages.INVALID_CREDENTIALS)
         
-        if not user.is_active:
+        if not is_active:
             raise ValueError(ErrorMessages.ACCOUNT_DEACTIVATED)
         
+        return await run_in_threadpool(self._complete_login, user_id, upgraded_hash)
+    
+    def _load_credentials(self, username: str) -> Optional[tuple]:
+        user = get_user_by_username_or_email(self.db, username)
+        if not user:
+            return None
+        credentials = (user.id, user.password_hash, user.is_active)
+        # End the read transaction so the connection returns to the pool during hashing
+        self.db.rollback()
+        return credentials
+    
+    def _complete_login(self, user_id: str, upgraded_hash: Optional[str]) -> AuthResponse:
+        user = get_user_by_id(self.db, user_id)
+        if not user:
+            raise ValueError(ErrorMessages.INVALID_CREDENTIALS)
+        
         user.last_login_at = datetime.utcnow()
+        if upgraded_hash:
+            # The stored hash used an outdated cost; replace it while the password is at hand
+            user.password_hash = upgraded_hash
+            metrics.increment("password_hash.rehashed")
         self.db.commit()
         
         access_token = create_access_token(
@@ -0,0 +1,119 @@
+import json
+import os
+import uuid
+import zipfile
+from typing import Iterator, List
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.segment import Segment
+from app.crud.segment import get_segment, get_segments_from
+from app.services.access_service import authorize_folder
+from app.services.segment_service import segment_to_response
+from app.services.audio_service import get_file_identity, get_media_type, open_segment_body
+from app.constants import ErrorMessages
+
+BUNDLE_FORMATS = ("multipart", "zip")
+
+
+class _ChunkSink:
+    """Write-only file object that hands whatever zipfile wrote back to the generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _audio_name(segment: Segment) -> str:
+    file_extension = os.path.splitext(segment.file_path)[1].lower()
+    return f"{segment.segment_number:05d}-{segment.id}{file_extension}"
+
+
+def _iter_multipart(entries: List[tuple], boundary: str) -> Iterator[bytes]:
+    for segment, metadata, identity in entries:
+        body = json.dumps(metadata).encode()
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Segment-Id: {segment.id}\r\n\r\n"
+        ).encode() + body + b"\r\n"
+        if identity is None:
+            continue
+        
+        size, chunks = open_segment_body(segment, identity)
+        yield (
+            f"--{boundary}\r\n"
+            f"Content-Type: {get_media_type(segment.file_path)}\r\n"
+            f"Content-Length: {size}\r\n"
+            f"Content-Disposition: attachment; filename=\"{_audio_name(segment)}\"\r\n"
+            f"X-Segment-Id: {segment.id}\r\n\r\n"
+        ).encode()
+        yield from chunks
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+
+def _iter_zip(entries: List[tuple]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    # Audio is already compressed or cheap to send as is, so entries are stored
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        manifest = [
+            {**metadata, "audioEntry": _audio_name(segment) if identity else None}
+            for segment, metadata, identity in entries
+        ]
+        archive.writestr("manifest.json", json.dumps(manifest))
+        yield sink.drain()
+        
+        for segment, _, identity in entries:
+            if identity is None:
+                continue
+            _, chunks = open_segment_body(segment, identity)
+            with archive.open(zipfile.ZipInfo(_audio_name(segment)), mode="w", force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def get_folder_bundle_service(
+    db: Session,
+    folder_id: int,
+    segment_id: int,
+    count: int,
+    bundle_format: str,
+    user: User
+) -> tuple:
+    """Resolve the next ``count`` segments from ``segment_id`` and return (media_type, body iterator).
+
+    Everything that needs the database happens here; the iterator only reads files.
+    """
+    if bundle_format not in BUNDLE_FORMATS:
+        raise ValueError(f"Unsupported bundle format: {bundle_format}")
+    
+    authorize_folder(db, folder_id, user)
+    
+    start_segment = get_segment(db, segment_id)
+    if not start_segment or start_segment.folder_id != folder_id:
+        raise ValueError(ErrorMessages.SEGMENT_NOT_FOUND)
+    
+    entries = []
+    for segment in get_segments_from(db, folder_id, start_segment.segment_number, count):
+        identity = get_file_identity(segment.file_path, segment.file_key) if segment.file_path else None
+        entries.append((segment, segment_to_response(segment).dict(), identity))
+    
+    if bundle_format == "zip":
+        return "application/zip", _iter_zip(entries)
+    boundary = uuid.uuid4().hex
+    return f"multipart/mixed; boundary={boundary}", _iter_multipart(entries, boundary)
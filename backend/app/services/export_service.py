@@ -0,0 +1,163 @@
+import csv
+from typing import Callable, Iterator, Optional
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.crud.segment import iter_segment_rows
+from app.services.access_service import authorize_project, authorize_folder
+from app.core.database import SessionLocal
+from app.core.serialization import dumps
+from app.core.config import settings
+from app.constants import ErrorMessages
+
+EXPORT_TEXTS = ("transcription", "translation", "both")
+
+# Response field -> Segment column, in CSV and NDJSON order
+EXPORT_FIELDS = {
+    "id": "id",
+    "folderId": "folder_id",
+    "segmentNumber": "segment_number",
+    "startTime": "start_time",
+    "endTime": "end_time",
+    "duration": "duration",
+    "transcription": "transcription",
+    "translation": "translation",
+    "isTranscribed": "is_transcribed",
+    "isTranslated": "is_translated",
+    "isApproved": "is_approved",
+    "genre": "genre",
+}
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    milliseconds = int(round(max(seconds or 0.0, 0.0) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def _lines(value: Optional[str]) -> str:
+    # A blank line would end a subtitle cue or paragraph early
+    return "\n".join(line.strip() for line in (value or "").splitlines() if line.strip())
+
+
+def _cue_text(row, text: str) -> str:
+    if text == "both":
+        return "\n".join(part for part in (_lines(row.transcription), _lines(row.translation)) if part)
+    return _lines(getattr(row, text))
+
+
+def _iter_srt(rows, text: str) -> Iterator[str]:
+    number = 0
+    for row in rows:
+        cue = _cue_text(row, text)
+        if not cue:
+            continue
+        number += 1
+        yield f"{number}\n{_timestamp(row.start_time, ',')} --> {_timestamp(row.end_time, ',')}\n{cue}\n\n"
+
+
+def _iter_vtt(rows, text: str) -> Iterator[str]:
+    yield "WEBVTT\n\n"
+    for row in rows:
+        cue = _cue_text(row, text)
+        if cue:
+            yield f"{_timestamp(row.start_time, '.')} --> {_timestamp(row.end_time, '.')}\n{cue}\n\n"
+
+
+def _iter_txt(rows, text: str) -> Iterator[str]:
+    for row in rows:
+        paragraph = _cue_text(row, text)
+        if paragraph:
+            yield paragraph + "\n\n"
+
+
+class _LineSink:
+    """File object for csv.writer that hands back each line it wrote"""
+
+    def __init__(self):
+        self.line = ""
+
+    def write(self, data: str) -> int:
+        self.line += data
+        return len(data)
+
+    def drain(self) -> str:
+        line, self.line = self.line, ""
+        return line
+
+
+def _iter_csv(rows, text: str) -> Iterator[str]:
+    sink = _LineSink()
+    writer = csv.writer(sink)
+    writer.writerow(EXPORT_FIELDS)
+    yield sink.drain()
+    for row in rows:
+        writer.writerow(row)
+        yield sink.drain()
+
+
+def _iter_ndjson(rows, text: str) -> Iterator[bytes]:
+    names = list(EXPORT_FIELDS)
+    for row in rows:
+        yield dumps(dict(zip(names, row))) + b"\n"
+
+
+# format -> (media type, file extension, line writer); Starlette adds the charset to text/ types
+EXPORT_FORMATS = {
+    "srt": ("application/x-subrip; charset=utf-8", "srt", _iter_srt),
+    "vtt": ("text/vtt", "vtt", _iter_vtt),
+    "csv": ("text/csv", "csv", _iter_csv),
+    "ndjson": ("application/x-ndjson", "ndjson", _iter_ndjson),
+    "txt": ("text/plain", "txt", _iter_txt),
+}
+
+
+def _iter_export(writer: Callable, text: str, **scope) -> Iterator[bytes]:
+    """Run the export query on its own session and yield the output in EXPORT_CHUNK_SIZE chunks.
+
+    The request's session is closed by the time a streamed body is sent, so
+    the generator owns a session for exactly as long as the rows are read.
+    """
+    db = SessionLocal()
+    try:
+        rows = iter_segment_rows(db, list(EXPORT_FIELDS.values()), batch_size=settings.EXPORT_BATCH_SIZE, **scope)
+        chunk = []
+        size = 0
+        for piece in writer(rows, text):
+            if isinstance(piece, str):
+                piece = piece.encode("utf-8")
+            chunk.append(piece)
+            size += len(piece)
+            if size >= settings.EXPORT_CHUNK_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield b"".join(chunk)
+    finally:
+        db.close()
+
+
+def _export_format(export_format: str, text: str) -> tuple:
+    if export_format not in EXPORT_FORMATS or text not in EXPORT_TEXTS:
+        raise ValueError(ErrorMessages.UNSUPPORTED_EXPORT_FORMAT)
+    return EXPORT_FORMATS[export_format]
+
+
+def export_project_service(db: Session, project_id: int, user: User, export_format: str, text: str = "transcription") -> tuple:
+    """Authorize the project and return (media_type, filename, body iterator) of its segments.
+
+    ``text`` picks what subtitle and plain text cues carry; CSV and NDJSON
+    always include both transcription and translation.
+    """
+    media_type, extension, writer = _export_format(export_format, text)
+    authorize_project(db, project_id, user)
+    return media_type, f"project-{project_id}.{extension}", _iter_export(writer, text, project_id=project_id)
+
+
+def export_folder_service(db: Session, folder_id: int, user: User, export_format: str, text: str = "transcription") -> tuple:
+    """Authorize the folder and return (media_type, filename, body iterator) of its segments"""
+    media_type, extension, writer = _export_format(export_format, text)
+    authorize_folder(db, folder_id, user)
+    return media_type, f"folder-{folder_id}.{extension}", _iter_export(writer, text, folder_id=folder_id)
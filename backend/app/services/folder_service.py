@@ -1,12 +1,13 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from app.models.user import User
-from app.crud.folder import get_folders, get_folder, create_folder, update_folder, delete_folder
-from app.crud.project import get_project
-from app.crud.user import get_user_languages
+from app.models.project import Folder
+from app.crud.folder import get_folders, create_folder, update_folder, delete_folder
+from app.services.access_service import language_scope, authorize_project, authorize_folder
 from app.schemas.folder import FolderCreate, FolderUpdate
 from app.schemas.response import FolderResponse, MessageResponse
-from app.constants import ErrorMessages, SuccessMessages, UserRole
+from app.core.fieldsets import Fieldset
+from app.constants import ErrorMessages, SuccessMessages
 
 def folder_to_response(folder) -> FolderResponse:
     return FolderResponse(
@@ -18,84 +19,39 @@ def folder_to_response(folder) -> FolderResponse:
         updatedAt=folder.updated_at.isoformat()
     )
 
+FOLDER_FIELDSET = Fieldset(Folder, FolderResponse)
+
 def get_folder_by_id_service(db: Session, folder_id: int, user: User) -> FolderResponse:
-    folder = get_folder(db, folder_id)
-    if not folder:
-        raise ValueError(ErrorMessages.FOLDER_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, folder.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_FOLDER)
+    folder = authorize_folder(db, folder_id, user)
     
     return folder_to_response(folder)
 
-def get_project_folders_service(db: Session, project_id: int, user: User) -> List[FolderResponse]:
-    project = get_project(db, project_id)
-    if not project:
-        raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_PROJECT)
-    
-    folders = get_folders(db, project_id)
-    return [folder_to_response(folder) for folder in folders]
+def get_project_folders_service(db: Session, project_id: int, user: User, fields: Optional[str] = None) -> bytes:
+    """A project's folders as JSON, selecting only the columns behind the requested ``fields`` (all by default)"""
+    names = FOLDER_FIELDSET.parse(fields)
+    columns = FOLDER_FIELDSET.columns(names)
+    folders = get_folders(db, project_id, language_scope(db, user), columns)
+    if not folders:
+        # An empty result is either an empty project or one the user cannot see
+        authorize_project(db, project_id, user)
+    
+    return FOLDER_FIELDSET.dumps(folders, names)
 
 def create_folder_service(db: Session, project_id: int, folder_data: FolderCreate, user: User) -> FolderResponse:
-    project = get_project(db, project_id)
-    if not project:
-        raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_PROJECT)
+    authorize_project(db, project_id, user)
     
     folder_data.project_id = project_id
     new_folder = create_folder(db, folder_data)
     return folder_to_response(new_folder)
 
 def update_folder_service(db: Session, folder_id: int, folder_update: FolderUpdate, user: User) -> FolderResponse:
-    folder = get_folder(db, folder_id)
-    if not folder:
-        raise ValueError(ErrorMessages.FOLDER_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, folder.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_FOLDER)
+    authorize_folder(db, folder_id, user)
     
     updated_folder = update_folder(db, folder_id, folder_update)
     return folder_to_response(updated_folder)
 
 def delete_folder_service(db: Session, folder_id: int, user: User) -> MessageResponse:
-    folder = get_folder(db, folder_id)
-    if not folder:
-        raise ValueError(ErrorMessages.FOLDER_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, folder.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_FOLDER)
+    authorize_folder(db, folder_id, user)
     
     success = delete_folder(db, folder_id)
     if not success:
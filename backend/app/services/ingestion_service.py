@@ -0,0 +1,106 @@
+import json
+import logging
+import time
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.processing_queue import ProcessingQueue
+from app.models.project import Folder
+from app.crud.project import get_project
+from app.crud.processing_queue import claim_next_queue_item, claim_abandoned_queue_items
+from app.schemas.upload import StoredFile
+from app.services.upload_service import add_stored_files_to_folder
+from app.services.storage_service import release_blobs
+from app.constants import ErrorMessages, ProjectStatus, ProcessingStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _fail_item(db: Session, item: ProcessingQueue, error_message: str) -> None:
+    """Mark an item and its project failed for good; the caller commits"""
+    item.status = ProcessingStatus.FAILED.value
+    item.error_message = error_message
+    project = get_project(db, item.project_id)
+    if project:
+        project.status = ProjectStatus.FAILED.value
+
+
+def _release_item_files(db: Session, item: ProcessingQueue) -> None:
+    """Drop the stored files of a failed item that nothing else references"""
+    payload = json.loads(item.payload) if item.payload else {}
+    release_blobs(db, [stored_file["file_path"] for stored_file in payload.get("files", [])])
+
+
+def fail_abandoned_items(db: Session, stale_after_seconds: int) -> int:
+    """Fail items whose worker died during the final attempt, which would otherwise stay PROCESSING forever"""
+    items = claim_abandoned_queue_items(db, stale_after_seconds)
+    for item in items:
+        logger.warning("Queue item %s abandoned after %s attempts, marking it failed", item.id, item.attempts)
+        _fail_item(db, item, ErrorMessages.INGESTION_ABANDONED)
+    db.commit()
+    for item in items:
+        _release_item_files(db, item)
+    return len(items)
+
+
+def process_queue_item(db: Session, item: ProcessingQueue) -> None:
+    """Probe the queued files and create their segments, retrying until max_attempts on failure"""
+    try:
+        project = get_project(db, item.project_id)
+        if not project:
+            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
+        
+        if not project.processing_started_at:
+            project.processing_started_at = datetime.utcnow()
+            db.commit()
+        
+        payload = json.loads(item.payload)
+        folder = db.query(Folder).filter(Folder.id == payload["folder_id"]).first()
+        if not folder:
+            raise ValueError(ErrorMessages.FOLDER_NOT_FOUND)
+        stored_files = [StoredFile(**stored_file) for stored_file in payload["files"]]
+        
+        # Segments, project totals and the queue status land in one transaction,
+        # so a failed attempt leaves nothing behind for the retry to trip over
+        total_segments, total_duration, _ = add_stored_files_to_folder(db, project, folder, stored_files)
+        project.total_segments = total_segments
+        project.duration = total_duration
+        project.status = ProjectStatus.READY_FOR_TRANSCRIPTION.value
+        project.processing_completed_at = datetime.utcnow()
+        item.status = ProcessingStatus.COMPLETED.value
+        item.error_message = None
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.exception("Error processing queue item %s (attempt %s)", item.id, item.attempts)
+        if item.attempts >= item.max_attempts:
+            _fail_item(db, item, str(e))
+            db.commit()
+            _release_item_files(db, item)
+        else:
+            item.status = ProcessingStatus.PENDING.value
+            item.error_message = str(e)
+            db.commit()
+
+
+def process_next_item(db: Session) -> bool:
+    fail_abandoned_items(db, settings.INGESTION_STALE_SECONDS)
+    item = claim_next_queue_item(db, settings.INGESTION_STALE_SECONDS)
+    if not item:
+        return False
+    process_queue_item(db, item)
+    return True
+
+
+def run_worker(poll_interval: float = None) -> None:
+    """Claim and process queue items until interrupted, sleeping when the queue is empty"""
+    poll_interval = settings.INGESTION_POLL_INTERVAL if poll_interval is None else poll_interval
+    while True:
+        db = SessionLocal()
+        try:
+            while process_next_item(db):
+                pass
+        finally:
+            db.close()
+        time.sleep(poll_interval)
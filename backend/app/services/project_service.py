@@ -1,10 +1,19 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from app.models.user import User
-from app.crud.project import get_projects, get_project, update_project, delete_project, recalculate_project_stats
-from app.crud.user import get_user_languages
+from app.models.project import Project
+from app.models.segment import Segment
+from app.crud.project import PROJECT_SORT_COLUMNS, get_projects, get_project, update_project, delete_project, recalculate_project_stats
+from app.services.access_service import language_scope, authorize_project
 from app.schemas.project import ProjectUpdate
 from app.schemas.response import ProjectResponse, MessageResponse
+from app.services.storage_service import release_blobs
+from app.services.audio_service import signed_file_url
+from app.core.config import settings
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.fieldsets import Fieldset
+from app.core.serialization import dumps
 from app.constants import ErrorMessages, SuccessMessages, UserRole
 
 def project_to_response(project) -> ProjectResponse:
@@ -13,7 +22,7 @@ def project_to_response(project) -> ProjectResponse:
         name=project.name,
         originalFilename=project.original_filename,
         filePath=project.file_path,
-        fileUrl=project.file_url,
+        fileUrl=_project_file_url(project),
         fileKey=project.file_key,
         fileSize=project.file_size,
         mimeType=project.mime_type,
@@ -35,31 +44,64 @@ def project_to_response(project) -> ProjectResponse:
         updatedAt=project.updated_at.isoformat()
     )
 
-def get_user_projects(db: Session, user: User) -> List[ProjectResponse]:
-    if user.role in [UserRole.ADMIN, UserRole.MANAGER]:
-        projects = get_projects(db)
-    else:
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        
-        if not language_ids:
-            return []
-        
-        projects = get_projects(db, language_ids=language_ids)
-    
-    return [project_to_response(project) for project in projects]
+def _project_file_url(project) -> Optional[str]:
+    return signed_file_url(project.file_path, project.file_key) or project.file_url
 
-def get_project_by_id_service(db: Session, project_id: int, user: User) -> ProjectResponse:
-    project = get_project(db, project_id)
-    if not project:
-        raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
+PROJECT_FIELDSET = Fieldset(Project, ProjectResponse, computed={
+    "fileUrl": (("file_path", "file_key", "file_url"), _project_file_url),
+})
+
+def _decode_project_cursor(cursor: str, sort: str) -> tuple:
+    """Keyset position of a project cursor, which is only valid for the sort it was issued under"""
+    cursor_sort, value, project_id = decode_cursor(cursor, (str, str, int))
+    if cursor_sort != sort:
+        raise ValueError(ErrorMessages.INVALID_CURSOR)
+    if sort.lstrip("-") != "name":
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(ErrorMessages.INVALID_CURSOR)
+    return value, project_id
+
+def get_user_projects(
+    db: Session,
+    user: User,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    filters: Optional[dict] = None,
+    name_prefix: Optional[str] = None,
+    sort: str = "-createdAt",
+    fields: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """One page of the projects a user may see as JSON, and the cursor of the next; without
+    a cursor or limit every matching project is returned. Only the columns behind the
+    requested ``fields`` (all by default) are selected."""
+    after = _decode_project_cursor(cursor, sort) if cursor else None
+    if after is not None and limit is None:
+        limit = settings.PROJECT_PAGE_SIZE
     
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_PROJECT)
+    names = PROJECT_FIELDSET.parse(fields)
+    column = PROJECT_SORT_COLUMNS[sort.lstrip("-")].key
+    columns = PROJECT_FIELDSET.columns(names, ("id", column))
     
+    language_ids = language_scope(db, user)
+    if language_ids is not None and not language_ids:
+        return dumps([]), None
+    
+    projects = get_projects(
+        db, language_ids=language_ids, filters=filters, name_prefix=name_prefix,
+        sort=sort, after=after, limit=limit, columns=columns
+    )
+    
+    def project_key(project) -> tuple:
+        value = getattr(project, column)
+        return (sort, value if isinstance(value, str) else value.isoformat(), project.id)
+    
+    next_page = next_cursor(projects, limit, project_key)
+    return PROJECT_FIELDSET.dumps(projects, names), next_page
+
+def get_project_by_id_service(db: Session, project_id: int, user: User) -> ProjectResponse:
+    project = authorize_project(db, project_id, user)
     return project_to_response(project)
 
 def update_project_service(db: Session, project_id: int, project_update: ProjectUpdate, user: User) -> ProjectResponse:
@@ -92,8 +134,14 @@ def delete_project_service(db: Session, project_id: int, user: User) -> MessageR
     if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
         raise ValueError(ErrorMessages.INSUFFICIENT_PERMISSIONS)
     
+    file_paths = [project.file_path] + [
+        row.file_path for row in db.query(Segment.file_path).filter(Segment.project_id == project_id)
+    ]
+    
     success = delete_project(db, project_id)
     if not success:
         raise ValueError(ErrorMessages.INTERNAL_ERROR)
     
+    # Only blobs no other project or segment points at are removed from disk
+    release_blobs(db, file_paths)
     return MessageResponse(message=SuccessMessages.PROJECT_DELETED)
\ No newline at end of file
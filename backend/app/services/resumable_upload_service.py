@@ -0,0 +1,189 @@
+import os
+import uuid
+from typing import AsyncIterator
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.models.user import User
+from app.models.upload_session import UploadSession
+from app.crud.upload_session import (
+    get_upload_session, create_upload_session, update_upload_offset, delete_upload_session
+)
+from app.schemas.upload import UploadSessionCreate, StoredFile
+from app.schemas.response import UploadSessionResponse, MessageResponse
+from app.services.upload_service import ingest_stored_files, queue_stored_files
+from app.services.storage_service import store_existing_file, is_blob_path
+from app.core.config import settings
+from app.constants import ErrorMessages, SuccessMessages
+
+
+def upload_session_to_response(upload_session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=upload_session.id,
+        filename=upload_session.filename,
+        uploadLength=upload_session.upload_length,
+        uploadOffset=upload_session.upload_offset,
+        status=upload_session.status,
+        projectId=upload_session.project_id,
+        createdAt=upload_session.created_at.isoformat(),
+        updatedAt=upload_session.updated_at.isoformat()
+    )
+
+
+def preallocate_file(file_path: str, length: int) -> None:
+    """Reserve the full file size up front so chunks can be written in place at their offset"""
+    with open(file_path, "wb") as f:
+        try:
+            os.posix_fallocate(f.fileno(), 0, length)
+        except (AttributeError, OSError):
+            # Not supported on this platform or filesystem, fall back to a sparse file
+            f.truncate(length)
+
+
+def _write_at(fd: int, data: bytearray, offset: int) -> int:
+    view = memoryview(data)
+    written = 0
+    while written < len(view):
+        written += os.pwrite(fd, view[written:], offset + written)
+    return written
+
+
+def _get_active_upload(db: Session, upload_id: str, user: User) -> UploadSession:
+    """Load and row-lock an upload that is still receiving bytes.
+
+    The lock is held until the caller commits, so two requests can never
+    write, finalize or cancel the same upload at once; the one that finds
+    the row taken fails with UPLOAD_IN_PROGRESS instead of waiting.
+    """
+    upload_session = get_upload_session(db, upload_id, user.id, lock=True)
+    if not upload_session:
+        if get_upload_session(db, upload_id, user.id):
+            raise ValueError(ErrorMessages.UPLOAD_IN_PROGRESS)
+        raise ValueError(ErrorMessages.UPLOAD_NOT_FOUND)
+    if upload_session.status != "uploading":
+        raise ValueError(ErrorMessages.UPLOAD_ALREADY_COMPLETED)
+    return upload_session
+
+
+def create_upload_session_service(db: Session, upload_data: UploadSessionCreate, user: User) -> UploadSessionResponse:
+    if upload_data.upload_length <= 0:
+        raise ValueError(ErrorMessages.VALIDATION_ERROR)
+    if upload_data.upload_length > settings.MAX_RESUMABLE_FILE_SIZE:
+        raise ValueError(ErrorMessages.UPLOAD_TOO_LARGE)
+    
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    upload_id = str(uuid.uuid4())
+    file_extension = os.path.splitext(upload_data.filename)[1]
+    file_path = os.path.join(settings.UPLOAD_DIR, f"{upload_id}{file_extension}")
+    preallocate_file(file_path, upload_data.upload_length)
+    
+    upload_session = UploadSession(
+        id=upload_id,
+        user_id=user.id,
+        filename=upload_data.filename,
+        file_path=file_path,
+        upload_length=upload_data.upload_length,
+        upload_offset=0,
+        project_name=upload_data.project_name,
+        language_id=upload_data.language_id,
+        status="uploading"
+    )
+    try:
+        upload_session = create_upload_session(db, upload_session)
+    except BaseException:
+        os.remove(file_path)
+        raise
+    return upload_session_to_response(upload_session)
+
+
+def get_upload_session_service(db: Session, upload_id: str, user: User) -> UploadSessionResponse:
+    upload_session = get_upload_session(db, upload_id, user.id)
+    if not upload_session:
+        raise ValueError(ErrorMessages.UPLOAD_NOT_FOUND)
+    return upload_session_to_response(upload_session)
+
+
+async def write_upload_chunk_service(
+    db: Session,
+    upload_id: str,
+    upload_offset: int,
+    stream: AsyncIterator[bytes],
+    user: User
+) -> UploadSessionResponse:
+    """Write a request body into the preallocated file starting at upload_offset.
+
+    Bytes received before a dropped connection are kept and the stored offset
+    advanced, so the client resumes from wherever the transfer stopped. The
+    session row stays locked until the new offset is committed, so a second
+    request at the same offset gets a conflict instead of writing over this one.
+    """
+    upload_session = await run_in_threadpool(_get_active_upload, db, upload_id, user)
+    if upload_offset != upload_session.upload_offset:
+        raise ValueError(ErrorMessages.UPLOAD_OFFSET_MISMATCH)
+    
+    offset = upload_offset
+    pending = bytearray()
+    fd = os.open(upload_session.file_path, os.O_WRONLY)
+    try:
+        async for chunk in stream:
+            if offset + len(pending) + len(chunk) > upload_session.upload_length:
+                raise ValueError(ErrorMessages.UPLOAD_TOO_LARGE)
+            pending += chunk
+            if len(pending) >= settings.UPLOAD_CHUNK_SIZE:
+                offset += await run_in_threadpool(_write_at, fd, pending, offset)
+                pending = bytearray()
+    finally:
+        try:
+            if pending:
+                offset += await run_in_threadpool(_write_at, fd, pending, offset)
+        finally:
+            os.close(fd)
+            await run_in_threadpool(update_upload_offset, db, upload_session, offset)
+    
+    return upload_session_to_response(upload_session)
+
+
+def finalize_upload_service(db: Session, upload_id: str, user: User) -> UploadSessionResponse:
+    upload_session = _get_active_upload(db, upload_id, user)
+    if upload_session.upload_offset != upload_session.upload_length:
+        raise ValueError(ErrorMessages.UPLOAD_INCOMPLETE)
+    
+    # The preallocated file already holds the assembled bytes. It is linked into the
+    # blob store and kept as the session's file until ingest succeeds, so a failed
+    # ingest can be finalized again without touching the blob other rows may share
+    digest, file_path, file_size = store_existing_file(
+        upload_session.file_path, upload_session.filename, keep_source=True
+    )
+    stored_file = StoredFile(
+        filename=upload_session.filename,
+        file_path=file_path,
+        file_key=digest,
+        file_size=file_size
+    )
+    # Completing the session rides on the ingest transaction, and is rolled back with it
+    session_file_path = upload_session.file_path
+    upload_session.status = "completed"
+    upload_session.file_path = file_path
+    if settings.INGESTION_MODE == "queue":
+        project = queue_stored_files(
+            db, [stored_file], user, upload_session.project_name, upload_session.language_id
+        )
+    else:
+        project, _ = ingest_stored_files(
+            db, [stored_file], user, upload_session.project_name, upload_session.language_id
+        )
+    
+    upload_session.project_id = project.id
+    db.commit()
+    db.refresh(upload_session)
+    if not is_blob_path(session_file_path) and os.path.exists(session_file_path):
+        os.remove(session_file_path)
+    return upload_session_to_response(upload_session)
+
+
+def cancel_upload_service(db: Session, upload_id: str, user: User) -> MessageResponse:
+    upload_session = _get_active_upload(db, upload_id, user)
+    # Only the session's own file; a path in the blob store may be shared
+    if not is_blob_path(upload_session.file_path) and os.path.exists(upload_session.file_path):
+        os.remove(upload_session.file_path)
+    delete_upload_session(db, upload_session)
+    return MessageResponse(message=SuccessMessages.UPLOAD_CANCELLED)
@@ -1,13 +1,20 @@
+import os
 from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from app.models.user import User
+from app.models.segment import Segment
 from app.crud.segment import get_segments, get_segments_by_folder, get_segment, update_segment, delete_segment
-from app.crud.project import get_project, recalculate_project_stats
-from app.crud.user import get_user_languages
-from app.crud.folder import get_folder
+from app.crud.project import recalculate_project_stats
+from app.services.access_service import language_scope, authorize_project, authorize_folder, authorize_segment
 from app.schemas.segment import SegmentUpdate
-from app.schemas.response import SegmentResponse, MessageResponse
+from app.schemas.response import SegmentResponse, MessageResponse, PeaksResponse
+from app.services.storage_service import release_blobs
+from app.services.audio_service import segment_file_url
+from app.audio.peaks import build_peaks_file, peaks_path, read_peaks_window
+from app.core.config import settings
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.fieldsets import Fieldset
 from app.constants import ErrorMessages, SuccessMessages, UserRole
 
 def segment_to_response(segment) -> SegmentResponse:
@@ -17,7 +24,7 @@ def segment_to_response(segment) -> SegmentResponse:
         projectId=segment.project_id,
         originalFilename=segment.original_filename,
         filePath=segment.file_path,
-        fileUrl=segment.file_url,
+        fileUrl=segment_file_url(segment),
         fileKey=segment.file_key,
         fileSize=segment.file_size,
         mimeType=segment.mime_type,
@@ -41,37 +48,62 @@ def segment_to_response(segment) -> SegmentResponse:
         updatedAt=segment.updated_at.isoformat()
     )
 
+# fileUrl depends on the clip window as well as the stored file
+SEGMENT_FIELDSET = Fieldset(Segment, SegmentResponse, computed={
+    "fileUrl": (
+        ("file_path", "file_key", "file_url", "processing_method", "start_time", "end_time"),
+        segment_file_url
+    ),
+})
+SEGMENT_KEY_COLUMNS = ("id", "segment_number")
+
 def get_segment_by_id_service(db: Session, segment_id: int, user: User) -> SegmentResponse:
-    segment = get_segment(db, segment_id)
-    if not segment:
-        raise ValueError(ErrorMessages.SEGMENT_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, segment.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_SEGMENT)
+    segment = authorize_segment(db, segment_id, user)
     
     return segment_to_response(segment)
 
-def update_segment_service(db: Session, segment_id: int, segment_update: SegmentUpdate, user: User) -> SegmentResponse:
-    existing_segment = get_segment(db, segment_id)
-    if not existing_segment:
-        raise ValueError(ErrorMessages.SEGMENT_NOT_FOUND)
+def get_segment_peaks_service(
+    db: Session,
+    segment_id: int,
+    user: User,
+    zoom: int = 0,
+    start: Optional[float] = None,
+    end: Optional[float] = None
+) -> PeaksResponse:
+    """Serve a window of the waveform peaks, defaulting to the segment's span of its recording"""
+    segment = authorize_segment(db, segment_id, user)
     
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, existing_segment.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_SEGMENT)
+    if not segment.file_path or not os.path.exists(segment.file_path):
+        raise ValueError(ErrorMessages.WAVEFORM_NOT_AVAILABLE)
+    
+    sidecar = peaks_path(segment.file_path)
+    if not os.path.exists(sidecar):
+        # Recordings ingested before sidecars existed are analyzed on first request
+        if not build_peaks_file(segment.file_path, segment.original_filename):
+            raise ValueError(ErrorMessages.WAVEFORM_NOT_AVAILABLE)
+    
+    if start is None:
+        start = segment.start_time or 0.0
+    if end is None:
+        end = segment.end_time
+    
+    window = read_peaks_window(sidecar, zoom, start, end)
+    if window is None:
+        raise ValueError(ErrorMessages.WAVEFORM_NOT_AVAILABLE)
+    
+    return PeaksResponse(
+        sampleRate=window['sample_rate'],
+        samplesPerPixel=window['samples_per_pixel'],
+        zoom=window['zoom'],
+        zoomLevels=window['zoom_levels'],
+        start=window['start'],
+        end=window['end'],
+        length=window['length'],
+        data=window['data']
+    )
+
+def update_segment_service(db: Session, segment_id: int, segment_update: SegmentUpdate, user: User) -> SegmentResponse:
+    existing_segment = authorize_segment(db, segment_id, user)
     
     update_data = segment_update.dict(exclude_unset=True)
     if segment_update.is_transcribed:
@@ -90,37 +122,63 @@ def update_segment_service(db: Session, segment_id: int, segment_update: Segment
     
     return segment_to_response(updated_segment)
 
-def get_project_segments_service(db: Session, project_id: int, user: User) -> List[SegmentResponse]:
-    project = get_project(db, project_id)
-    if not project:
-        raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-    
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_PROJECT)
+def _segment_key(segment) -> tuple:
+    return (segment.segment_number, segment.id)
+
+def _page_window(cursor: Optional[str], limit: Optional[int]) -> Tuple[Optional[tuple], Optional[int]]:
+    """Keyset position and page size; without either the whole list is returned as before"""
+    after = decode_cursor(cursor, (int, int)) if cursor else None
+    if after is not None and limit is None:
+        limit = settings.SEGMENT_PAGE_SIZE
+    return after, limit
+
+def get_project_segments_service(
+    db: Session,
+    project_id: int,
+    user: User,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    filters: Optional[dict] = None,
+    fields: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """One page of a project's segments in (segment_number, id) order as JSON, and the cursor of the next.
+
+    Only the columns behind the requested ``fields`` (all by default) are selected.
+    """
+    after, limit = _page_window(cursor, limit)
+    names = SEGMENT_FIELDSET.parse(fields)
+    columns = SEGMENT_FIELDSET.columns(names, SEGMENT_KEY_COLUMNS)
+    segments = get_segments(db, project_id, language_scope(db, user), after, limit, filters, columns)
+    if not segments:
+        # An empty result is either an empty project or one the user cannot see
+        authorize_project(db, project_id, user)
     
-    segments = get_segments(db, project_id)
-    return [segment_to_response(segment) for segment in segments]
+    next_page = next_cursor(segments, limit, _segment_key)
+    return SEGMENT_FIELDSET.dumps(segments, names), next_page
 
-def get_folder_segments_service(db: Session, folder_id: int, user: User) -> List[SegmentResponse]:
-    folder = get_folder(db, folder_id)
-    if not folder:
-        raise ValueError(ErrorMessages.FOLDER_NOT_FOUND)
+def get_folder_segments_service(
+    db: Session,
+    folder_id: int,
+    user: User,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    filters: Optional[dict] = None,
+    fields: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """One page of a folder's segments in (segment_number, id) order as JSON, and the cursor of the next.
+
+    Only the columns behind the requested ``fields`` (all by default) are selected.
+    """
+    after, limit = _page_window(cursor, limit)
+    names = SEGMENT_FIELDSET.parse(fields)
+    columns = SEGMENT_FIELDSET.columns(names, SEGMENT_KEY_COLUMNS)
+    segments = get_segments_by_folder(db, folder_id, language_scope(db, user), after, limit, filters, columns)
+    if not segments:
+        # An empty result is either an empty folder or one the user cannot see
+        authorize_folder(db, folder_id, user)
     
-    if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
-        project = get_project(db, folder.project_id)
-        if not project:
-            raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
-        
-        user_languages = get_user_languages(db, user.id)
-        language_ids = [lang["id"] for lang in user_languages]
-        if project.language_id not in language_ids:
-            raise ValueError(ErrorMessages.NO_PERMISSION_FOLDER)
-    
-    segments = get_segments_by_folder(db, folder_id)
-    return [segment_to_response(segment) for segment in segments]
+    next_page = next_cursor(segments, limit, _segment_key)
+    return SEGMENT_FIELDSET.dumps(segments, names), next_page
 
 def delete_segment_service(db: Session, segment_id: int, user: User) -> MessageResponse:
     if user.role not in [UserRole.ADMIN, UserRole.MANAGER]:
@@ -130,9 +188,13 @@ def delete_segment_service(db: Session, segment_id: int, user: User) -> MessageR
     if not segment:
         raise ValueError(ErrorMessages.SEGMENT_NOT_FOUND)
     
+    project_id = segment.project_id
+    file_path = segment.file_path
+    
     success = delete_segment(db, segment_id)
     if not success:
         raise ValueError(ErrorMessages.INTERNAL_ERROR)
     
-    recalculate_project_stats(db, segment.project_id)
+    release_blobs(db, [file_path])
+    recalculate_project_stats(db, project_id)
     return MessageResponse(message=SuccessMessages.SEGMENT_DELETED)
\ No newline at end of file
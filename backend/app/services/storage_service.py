@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import BinaryIO, Iterable, Optional
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.segment import Segment
+from app.models.processing_queue import ProcessingQueue
+from app.core.config import settings
+from app.core import metrics
+from app.constants import ProcessingStatus
+from app.audio.peaks import PEAKS_SUFFIX, peaks_path
+from app.services.audio_service import forget_file_identity
+
+BLOB_DIR_NAME = "blobs"
+
+
+def get_blob_dir() -> str:
+    return os.path.join(settings.UPLOAD_DIR, BLOB_DIR_NAME)
+
+
+def blob_path(digest: str, filename: str) -> str:
+    """Content-addressed location of a blob, fanned out by the first digest byte"""
+    file_extension = os.path.splitext(filename)[1].lower()
+    return os.path.join(get_blob_dir(), digest[:2], f"{digest}{file_extension}")
+
+
+def is_blob_path(file_path: Optional[str]) -> bool:
+    if not file_path:
+        return False
+    blob_dir = os.path.abspath(get_blob_dir()) + os.sep
+    return os.path.abspath(file_path).startswith(blob_dir)
+
+
+def _new_temp_path() -> str:
+    temp_dir = os.path.join(get_blob_dir(), "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    return os.path.join(temp_dir, str(uuid.uuid4()))
+
+
+def _commit_blob(temp_path: str, digest: str, filename: str, size: int, keep_source: bool = False) -> str:
+    """Move a fully written temp file into the blob store, or drop it if the content is already stored.
+
+    With ``keep_source`` the file is linked (or copied) in instead and left where it is.
+    """
+    final_path = blob_path(digest, filename)
+    if os.path.abspath(temp_path) == os.path.abspath(final_path):
+        # Already this blob (a retried commit); other rows may share it, so never remove it
+        os.utime(final_path)
+        return final_path
+    
+    metrics.increment("storage.files_stored")
+    if os.path.exists(final_path):
+        if not keep_source:
+            os.remove(temp_path)
+        # Refresh mtime so a concurrent sweep treats the blob as freshly used
+        os.utime(final_path)
+        metrics.increment("storage.dedup_hits")
+        metrics.increment("storage.bytes_deduplicated", size)
+        return final_path
+    
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    if keep_source:
+        linked_path = _new_temp_path()
+        try:
+            os.link(temp_path, linked_path)
+        except OSError:
+            # Different filesystem or no hard links, pay for a copy
+            shutil.copyfile(temp_path, linked_path)
+        temp_path = linked_path
+    os.replace(temp_path, final_path)
+    metrics.increment("storage.bytes_written", size)
+    return final_path
+
+
+def store_stream(
+    source: BinaryIO,
+    filename: str,
+    max_size: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> tuple:
+    """Copy a stream into the blob store in fixed-size chunks, hashing as it goes.
+
+    Returns (digest, file_path, size). Raises ValueError once more than
+    max_size bytes have been read, removing the partial file.
+    """
+    max_size = settings.MAX_FILE_SIZE if max_size is None else max_size
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    
+    temp_path = _new_temp_path()
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as buffer:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise ValueError(
+                        f"File {filename} exceeds the maximum size of {max_size} bytes"
+                    )
+                hasher.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    digest = hasher.hexdigest()
+    return digest, _commit_blob(temp_path, digest, filename, size), size
+
+
+def store_existing_file(
+    file_path: str,
+    filename: str,
+    chunk_size: Optional[int] = None,
+    keep_source: bool = False
+) -> tuple:
+    """Hash a file that is already on disk and move it into the blob store without copying.
+
+    Returns (digest, file_path, size). With ``keep_source`` the file stays in
+    place too (hard-linked into the store where possible) until the caller drops it.
+    """
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    
+    size = os.path.getsize(file_path)
+    digest = hasher.hexdigest()
+    return digest, _commit_blob(file_path, digest, filename, size, keep_source), size
+
+
+def _queued_blob_paths(db: Session) -> set:
+    """Blobs that pending or running ingestion items will still turn into segments"""
+    items = db.query(ProcessingQueue.payload).filter(
+        ProcessingQueue.status.in_([ProcessingStatus.PENDING.value, ProcessingStatus.PROCESSING.value])
+    )
+    return {
+        os.path.abspath(stored_file["file_path"])
+        for item in items if item.payload
+        for stored_file in json.loads(item.payload).get("files", [])
+    }
+
+
+def _leased(path: str, lease_seconds: int) -> bool:
+    """Whether an upload stored or deduplicated onto ``path`` recently enough that its rows may not be committed yet"""
+    try:
+        return os.path.getmtime(path) > time.time() - lease_seconds
+    except FileNotFoundError:
+        return False
+
+
+def release_blobs(db: Session, file_paths: Iterable[str], lease_seconds: Optional[int] = None) -> int:
+    """Remove blobs that no segment, project or queued ingestion references any more.
+
+    Call after the rows pointing at ``file_paths`` have been deleted and committed.
+    Blobs touched by an upload within ``lease_seconds`` (BLOB_LEASE_SECONDS by
+    default) are left for the sweep, since that upload's rows may still be in flight.
+    """
+    lease_seconds = settings.BLOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+    candidates = {path for path in file_paths if is_blob_path(path)}
+    if not candidates:
+        return 0
+    
+    keys = {os.path.splitext(os.path.basename(path))[0] for path in candidates}
+    still_used = {
+        row.file_path for row in db.query(Segment.file_path).filter(Segment.file_key.in_(keys))
+    }
+    still_used.update(
+        row.file_path for row in db.query(Project.file_path).filter(Project.file_key.in_(keys))
+    )
+    queued = _queued_blob_paths(db)
+    
+    removed = 0
+    for path in candidates - still_used:
+        if os.path.abspath(path) in queued or _leased(path, lease_seconds):
+            continue
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+        forget_file_identity(path)
+        if os.path.exists(peaks_path(path)):
+            os.remove(peaks_path(path))
+    metrics.increment("storage.blobs_released", removed)
+    return removed
+
+
+def sweep_unreferenced_blobs(db: Session, min_age_seconds: int = 3600) -> int:
+    """Mark-and-sweep pass that removes blobs, their sidecars and stale temp files no row references.
+
+    Files younger than ``min_age_seconds`` are skipped so uploads whose rows are
+    not committed yet are never collected, and so are blobs queued for ingestion.
+    """
+    blob_dir = get_blob_dir()
+    if not os.path.isdir(blob_dir):
+        return 0
+    
+    referenced = {
+        os.path.abspath(row.file_path)
+        for row in db.query(Segment.file_path).filter(Segment.file_key.isnot(None))
+    }
+    referenced.update(
+        os.path.abspath(row.file_path)
+        for row in db.query(Project.file_path).filter(Project.file_key.isnot(None))
+    )
+    referenced.update(_queued_blob_paths(db))
+    
+    cutoff = time.time() - min_age_seconds
+    removed = 0
+    for root, _, filenames in os.walk(blob_dir):
+        for name in filenames:
+            path = os.path.abspath(os.path.join(root, name))
+            # Sidecars live and die with the blob they describe
+            owner = path[:-len(PEAKS_SUFFIX)] if path.endswith(PEAKS_SUFFIX) else path
+            if owner in referenced or os.path.getmtime(path) > cutoff:
+                continue
+            os.remove(path)
+            removed += 1
+    metrics.increment("storage.blobs_swept", removed)
+    return removed
+
+
+def get_storage_stats() -> dict:
+    files_stored = metrics.get_counter("storage.files_stored")
+    dedup_hits = metrics.get_counter("storage.dedup_hits")
+    return {
+        "filesStored": files_stored,
+        "dedupHits": dedup_hits,
+        "dedupHitRate": metrics.ratio(dedup_hits, files_stored),
+        "bytesWritten": metrics.get_counter("storage.bytes_written"),
+        "bytesDeduplicated": metrics.get_counter("storage.bytes_deduplicated"),
+    }
+
+
+metrics.register_stats_provider("storage", get_storage_stats)
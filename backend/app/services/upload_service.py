@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from fastapi import UploadFile, Form
 from typing import List, Optional
 from app.schemas.response import MessageResponse
@@ -7,18 +8,32 @@ from app.models.project import Project
 from app.models.language import Language
 from app.models.project import Folder
 from app.models.segment import Segment
-from app.crud.project import create_project
+from app.crud.project import create_project, get_project
 from app.crud.folder import create_folder
-from app.crud.segment import create_segment
+from app.crud.segment import bulk_create_segments, get_max_segment_number
 from app.schemas.project import ProjectCreate
 from app.schemas.folder import FolderCreate
 from app.schemas.segment import SegmentCreate
-from app.constants import SuccessMessages
+from app.schemas.upload import StoredFile
+from app.services.storage_service import store_stream, release_blobs
+from app.services.access_service import authorize_folder
+from app.audio.headers import read_audio_header
+from app.audio.clips import can_clip
+from app.audio.pcm import open_audio_blocks
+from app.audio.peaks import PeaksBuilder, peaks_path
+from app.audio.segmentation import EnergySegmenter
+from app.crud.processing_queue import enqueue_ingestion
+from app.constants import SuccessMessages, ErrorMessages, ProjectStatus
+from app.core.config import settings
+import logging
 import os
-import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
 import mimetypes
 
+logger = logging.getLogger(__name__)
+
 def is_audio_file(filename: str) -> bool:
     """Check if file is an audio file based on extension"""
     audio_extensions = {'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac', '.wma', '.aiff'}
@@ -36,6 +51,16 @@ def get_audio_metadata(file_path: str, filename: str) -> dict:
             'is_audio': False
         }
     
+    # Exact values straight from the container header, without decoding
+    header = read_audio_header(file_path, filename)
+    if header is not None:
+        return {
+            'duration': header['duration'],
+            'sample_rate': header['sample_rate'],
+            'channels': header['channels'],
+            'is_audio': True
+        }
+    
     try:
         # Try to extract real metadata from the audio file
         import mutagen
@@ -56,9 +81,12 @@ def get_audio_metadata(file_path: str, filename: str) -> dict:
     except Exception as e:
         print(f"Error extracting metadata from {filename}: {e}")
     
-    # Fallback: try to estimate duration from file size for common formats
+    # Fallback: estimate duration from file size for common formats
+    return estimate_audio_metadata(file_path, filename)
+
+def estimate_audio_metadata(file_path: str, filename: str) -> dict:
+    """Estimate audio metadata from file size when the headers cannot be read"""
     try:
-        import os
         file_size = os.path.getsize(file_path)
         file_extension = os.path.splitext(filename)[1].lower()
         
@@ -93,6 +121,189 @@ def get_audio_metadata(file_path: str, filename: str) -> dict:
         'is_audio': True
     }
 
+def _probe_file(args: tuple) -> dict:
+    file_path, filename = args
+    started = time.perf_counter()
+    metadata = get_audio_metadata(file_path, filename)
+    metadata['splits'] = analyze_recording(file_path, filename, metadata)
+    metadata['probe_seconds'] = time.perf_counter() - started
+    return metadata
+
+def analyze_recording(file_path: str, filename: str, metadata: dict) -> Optional[List[tuple]]:
+    """Decode a stored recording once to write its waveform peaks and find pause-aligned splits.
+
+    Returns (start, end, confidence) spans for a long recording, or None to keep it whole.
+    """
+    if not metadata['is_audio']:
+        return None
+    # A split segment is served as a window of the stored file, so only formats
+    # that can be cut in place are split; the rest stay one segment
+    wants_splits = (
+        settings.AUTO_SEGMENT_ENABLED
+        and metadata['duration'] >= settings.AUTO_SEGMENT_MIN_DURATION
+        and can_clip(file_path)
+    )
+    # Blobs are shared by content, so a duplicate upload reuses the existing sidecar
+    wants_peaks = settings.WAVEFORM_PEAKS_ENABLED and not os.path.exists(peaks_path(file_path))
+    if not wants_splits and not wants_peaks:
+        return None
+    
+    try:
+        opened = open_audio_blocks(file_path, filename)
+        if opened is None:
+            return None
+        sample_rate, blocks = opened
+        segmenter = EnergySegmenter(
+            sample_rate,
+            min_pause=settings.AUTO_SEGMENT_MIN_PAUSE,
+            min_segment=settings.AUTO_SEGMENT_MIN_LENGTH,
+            max_segment=settings.AUTO_SEGMENT_MAX_LENGTH
+        ) if wants_splits else None
+        peaks = PeaksBuilder(sample_rate) if wants_peaks else None
+        
+        for block in blocks:
+            if segmenter:
+                segmenter.feed(block)
+            if peaks:
+                peaks.feed(block)
+        
+        if peaks:
+            peaks.write(peaks_path(file_path))
+        splits = segmenter.finish() if segmenter else None
+    except Exception:
+        logger.exception("Error analyzing %s", filename)
+        return None
+    
+    return splits if splits and len(splits) > 1 else None
+
+def probe_audio_metadata(
+    files: List[tuple],
+    max_workers: Optional[int] = None,
+    executor: Optional[str] = None
+) -> List[dict]:
+    """Probe (file_path, filename) pairs concurrently, returning metadata in input order.
+
+    Each result carries a ``probe_seconds`` entry with the time spent on that file.
+    """
+    if not files:
+        return []
+    
+    max_workers = max_workers or settings.METADATA_PROBE_WORKERS
+    executor = executor or settings.METADATA_PROBE_EXECUTOR
+    if max_workers <= 1 or len(files) == 1:
+        return [_probe_file(item) for item in files]
+    
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=min(max_workers, len(files))) as pool:
+        return list(pool.map(_probe_file, files))
+
+def save_upload_file(file: UploadFile) -> StoredFile:
+    """Stream an uploaded file into the content-addressed store, enforcing the size limit"""
+    digest, file_path, file_size = store_stream(file.file, file.filename)
+    return StoredFile(
+        filename=file.filename,
+        file_path=file_path,
+        file_key=digest,
+        file_size=file_size
+    )
+
+def save_upload_files(db: Session, files: List[UploadFile]) -> List[StoredFile]:
+    """Save every named file of a batch, releasing already stored files if one fails"""
+    stored_files = []
+    try:
+        for file in files:
+            if not file.filename:
+                continue
+            stored_files.append(save_upload_file(file))
+    except BaseException:
+        remove_stored_files(db, stored_files)
+        raise
+    
+    return stored_files
+
+def remove_stored_files(db: Session, stored_files: List[StoredFile]) -> None:
+    """Drop stored files of a failed upload unless another segment or an in-flight upload may share the blob"""
+    release_blobs(db, [stored_file.file_path for stored_file in stored_files])
+
+def build_segments(
+    folder_id: int,
+    project_id: int,
+    stored_files: List[StoredFile],
+    metadata_list: List[dict],
+    first_segment_number: int = 1
+) -> tuple:
+    """Build SegmentCreate rows for stored files, returning (segments, total_duration, audio_files_count).
+
+    Long recordings with detected pauses become one segment per span, all
+    pointing at the same file and marked ``vad_split``.
+    """
+    segments = []
+    total_duration = 0
+    audio_files_count = 0
+    
+    for stored_file, metadata in zip(stored_files, metadata_list):
+        segment_index = len(segments)
+        splits = metadata.get('splits')
+        if metadata['is_audio'] and splits:
+            audio_files_count += 1
+            for start_time, end_time, confidence in splits:
+                segments.append(SegmentCreate(
+                    folder_id=folder_id,
+                    project_id=project_id,
+                    original_filename=stored_file.filename,
+                    file_path=stored_file.file_path,
+                    file_key=stored_file.file_key,
+                    file_size=stored_file.file_size,
+                    duration=end_time - start_time,
+                    segment_number=first_segment_number + len(segments),
+                    start_time=start_time,
+                    end_time=end_time,
+                    confidence=confidence,
+                    processing_method='vad_split'
+                ))
+            total_duration += splits[-1][1]
+            continue
+        
+        if metadata['is_audio']:
+            # For real audio files, create ONE segment per file
+            file_duration = metadata['duration']
+            audio_files_count += 1
+            segment_data = SegmentCreate(
+                folder_id=folder_id,
+                project_id=project_id,
+                original_filename=stored_file.filename,
+                file_path=stored_file.file_path,
+                file_key=stored_file.file_key,
+                file_size=stored_file.file_size,
+                duration=file_duration,
+                segment_number=first_segment_number + segment_index,
+                start_time=0.0,  # Each file starts at 0
+                end_time=file_duration,
+                confidence=0.9,  # Higher confidence for real audio
+                processing_method='audio_analysis'
+            )
+        else:
+            # For non-audio files, create a single segment with minimal duration
+            file_duration = 10.0  # 10 seconds for non-audio files
+            segment_data = SegmentCreate(
+                folder_id=folder_id,
+                project_id=project_id,
+                original_filename=stored_file.filename,
+                file_path=stored_file.file_path,
+                file_key=stored_file.file_key,
+                file_size=stored_file.file_size,
+                duration=file_duration,
+                segment_number=first_segment_number + segment_index,
+                start_time=segment_index * 10.0,
+                end_time=(segment_index + 1) * 10.0,
+                confidence=0.1,  # Low confidence for non-audio files
+                processing_method='file_upload'
+            )
+        total_duration += file_duration
+        segments.append(segment_data)
+    
+    return segments, total_duration, audio_files_count
+
 def process_batch_upload_service(
     db: Session, 
     files: List[UploadFile], 
@@ -103,6 +314,41 @@ def process_batch_upload_service(
     if not files:
         return MessageResponse(message="No files provided")
     
+    # Copy every file to disk before touching the database so an oversized
+    # file aborts the batch without leaving a half-built project behind
+    stored_files = save_upload_files(db, files)
+    if not stored_files:
+        return MessageResponse(message="No files provided")
+    
+    try:
+        if settings.INGESTION_MODE == "queue":
+            project = queue_stored_files(db, stored_files, user, project_name, language_id)
+            return MessageResponse(
+                message=f"Uploaded {len(stored_files)} files into project {project.id}, processing has been queued"
+            )
+        
+        project, audio_files_count = ingest_stored_files(db, stored_files, user, project_name, language_id)
+    except BaseException:
+        remove_stored_files(db, stored_files)
+        raise
+    
+    audio_info = f" ({audio_files_count} audio files)" if audio_files_count > 0 else ""
+    return MessageResponse(
+        message=f"Successfully uploaded {len(stored_files)} files{audio_info} into 1 project with 1 folder containing {project.total_segments} segments"
+    )
+
+def create_upload_project(
+    db: Session,
+    stored_files: List[StoredFile],
+    user: UserModel,
+    project_name: Optional[str] = None,
+    language_id: Optional[int] = None,
+    status: str = ProjectStatus.READY_FOR_TRANSCRIPTION.value
+) -> tuple:
+    """Flush (without committing) one project and its default folder for an upload.
+
+    Returns (project, folder).
+    """
     # Use provided language_id or default to first available language
     if not language_id:
         first_language = db.query(Language).first()
@@ -113,27 +359,24 @@ def process_batch_upload_service(
         final_project_name = project_name
     else:
         # Use the first file's name as project name
-        first_filename = files[0].filename if files[0].filename else "Unknown"
+        first_filename = stored_files[0].filename
         final_project_name = f"Project from {first_filename}"
     
-    # We'll calculate total duration after processing each file
-    total_duration = 0
-    audio_files_count = 0
-    
     # Create ONE project for all files
     project_data = ProjectCreate(
         name=final_project_name,
-        original_filename=files[0].filename if files[0].filename else "batch_upload",
-        file_path="",  # Will be set to first file's path
+        original_filename=stored_files[0].filename,
+        file_path=stored_files[0].file_path,
+        file_key=stored_files[0].file_key,
+        file_size=stored_files[0].file_size,
         duration=0,  # Will be calculated after processing files
         sample_rate=44100,  # Default sample rate
         channels=2,  # Default channels
         language_id=language_id,
         user_id=user.id,
-        status="ready_for_transcription"
+        status=status
     )
-    
-    project = create_project(db, project_data)
+    project = create_project(db, project_data, commit=False)
     
     # Create ONE folder for the project
     folder_data = FolderCreate(
@@ -141,87 +384,128 @@ def process_batch_upload_service(
         name="Main Folder",
         description=f"Default folder for {final_project_name}"
     )
-    folder = create_folder(db, folder_data)
+    folder = create_folder(db, folder_data, commit=False)
+    return project, folder
+
+def probe_stored_files(stored_files: List[StoredFile]) -> List[dict]:
+    """Metadata and VAD splits of every stored file, in order"""
+    return probe_audio_metadata(
+        [(stored_file.file_path, stored_file.filename) for stored_file in stored_files]
+    )
+
+def add_stored_files_to_folder(
+    db: Session,
+    project: Project,
+    folder: Folder,
+    stored_files: List[StoredFile],
+    first_segment_number: int = 1,
+    metadata_list: Optional[List[dict]] = None
+) -> tuple:
+    """Probe stored files and bulk insert their segments into the folder without committing.
+
+    Pass ``metadata_list`` when the files were already probed.
+    Returns (segments_created, total_duration, audio_files_count).
+    """
+    if metadata_list is None:
+        metadata_list = probe_stored_files(stored_files)
     
-    # Ensure uploads directory exists
-    os.makedirs("uploads", exist_ok=True)
+    segments, total_duration, audio_files_count = build_segments(
+        folder.id, project.id, stored_files, metadata_list, first_segment_number
+    )
+    segments_created = bulk_create_segments(db, segments, commit=False)
+    return segments_created, total_duration, audio_files_count
+
+def ingest_stored_files(
+    db: Session,
+    stored_files: List[StoredFile],
+    user: UserModel,
+    project_name: Optional[str] = None,
+    language_id: Optional[int] = None
+) -> tuple:
+    """Create one project, folder and segment set for files already on disk, in one transaction.
+
+    Returns (project, audio_files_count).
+    """
+    try:
+        project, folder = create_upload_project(db, stored_files, user, project_name, language_id)
+        total_segments, total_duration, audio_files_count = add_stored_files_to_folder(
+            db, project, folder, stored_files
+        )
+        
+        # Project totals are written in the same transaction as the segments
+        project.total_segments = total_segments
+        project.duration = total_duration
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
     
-    segments_created = 0
-    total_segments = 0
+    return project, audio_files_count
+
+def queue_stored_files(
+    db: Session,
+    stored_files: List[StoredFile],
+    user: UserModel,
+    project_name: Optional[str] = None,
+    language_id: Optional[int] = None
+) -> Project:
+    """Create a processing project for files already on disk and leave the rest to the ingestion worker"""
+    try:
+        project, folder = create_upload_project(
+            db, stored_files, user, project_name, language_id,
+            status=ProjectStatus.PROCESSING.value
+        )
+        enqueue_ingestion(db, project, folder, stored_files)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
     
-    # Process each file as a segment in the same folder
-    for file_index, file in enumerate(files):
-        if not file.filename:
-            continue
-            
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join("uploads", unique_filename)
-        
-        # Save file to disk
-        with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
+    return project
+
+def upload_folder_segments_service(
+    db: Session,
+    folder_id: int,
+    files: List[UploadFile],
+    user: UserModel
+) -> MessageResponse:
+    """Append uploaded files to an existing folder, numbering them after its last segment"""
+    if not files:
+        return MessageResponse(message="No files provided")
+    
+    folder = authorize_folder(db, folder_id, user)
+    project = get_project(db, folder.project_id)
+    if not project:
+        raise ValueError(ErrorMessages.PROJECT_NOT_FOUND)
+    
+    stored_files = save_upload_files(db, files)
+    if not stored_files:
+        return MessageResponse(message="No files provided")
+    
+    try:
+        # Probing and VAD take seconds; do them before the folder is locked
+        metadata_list = probe_stored_files(stored_files)
         
-        # Set project file_path to first file (for compatibility)
-        if file_index == 0:
-            project.file_path = file_path
-            db.commit()
-            db.refresh(project)
+        # Lock the folder so concurrent uploads into it get consecutive segment numbers
+        db.query(Folder).filter(Folder.id == folder_id).with_for_update().first()
+        first_segment_number = get_max_segment_number(db, folder_id) + 1
         
-        # Get metadata for this file (now that it's saved to disk)
-        metadata = get_audio_metadata(file_path, file.filename)
+        segments_created, total_duration, audio_files_count = add_stored_files_to_folder(
+            db, project, folder, stored_files, first_segment_number, metadata_list
+        )
         
-        if metadata['is_audio']:
-            # For real audio files, create ONE segment per file
-            file_duration = metadata['duration']
-            total_duration += file_duration
-            audio_files_count += 1
-            
-            segment_data = SegmentCreate(
-                folder_id=folder.id,
-                project_id=project.id,
-                original_filename=file.filename,
-                file_path=file_path,
-                duration=file_duration,
-                segment_number=segments_created + 1,
-                start_time=0.0,  # Each file starts at 0
-                end_time=file_duration,
-                confidence=0.9,  # Higher confidence for real audio
-                processing_method='audio_analysis'
-            )
-            create_segment(db, segment_data)
-            segments_created += 1
-            total_segments += 1
-        else:
-            # For non-audio files, create a single segment with minimal duration
-            file_duration = 10.0  # 10 seconds for non-audio files
-            total_duration += file_duration
-            
-            segment_data = SegmentCreate(
-                folder_id=folder.id,
-                project_id=project.id,
-                original_filename=file.filename,
-                file_path=file_path,
-                duration=file_duration,
-                segment_number=segments_created + 1,
-                start_time=segments_created * 10.0,
-                end_time=(segments_created + 1) * 10.0,
-                confidence=0.1,  # Low confidence for non-audio files
-                processing_method='file_upload'
-            )
-            create_segment(db, segment_data)
-            segments_created += 1
-            total_segments += 1
-    
-    # Update project with total segments count and duration
-    project.total_segments = total_segments
-    project.duration = total_duration
-    db.commit()
-    db.refresh(project)
+        # Bump the counters in SQL instead of recounting every segment of the project
+        db.query(Project).filter(Project.id == project.id).update({
+            Project.total_segments: func.coalesce(Project.total_segments, 0) + segments_created,
+            Project.duration: Project.duration + int(total_duration)
+        }, synchronize_session=False)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        remove_stored_files(db, stored_files)
+        raise
     
     audio_info = f" ({audio_files_count} audio files)" if audio_files_count > 0 else ""
     return MessageResponse(
-        message=f"Successfully uploaded {len(files)} files{audio_info} into 1 project with 1 folder containing {total_segments} segments"
+        message=f"Successfully uploaded {len(stored_files)} files{audio_info} into folder {folder.name} as segments {first_segment_number}-{first_segment_number + segments_created - 1}"
     )
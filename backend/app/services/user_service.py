@@ -1,14 +1,17 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 from app.models.user import User
 from app.crud.user import (
     get_users, create_user, update_user, deactivate_user, delete_user,
-    reset_user_password, get_user_stats, get_user_languages,
+    reset_user_password, get_user_stats, get_user_languages, user_languages_to_dicts,
     get_user_by_username, get_user_by_email, get_user_by_id
 )
 from app.schemas.user import UserCreate, UserUpdate
 from app.schemas.response import UserResponse, MessageResponse
+from app.core.config import settings
+from app.core.pagination import decode_cursor, next_cursor
+from app.core.fieldsets import Fieldset
 from app.constants import ErrorMessages, SuccessMessages, UserRole
 
 def user_to_response(user: User) -> UserResponse:
@@ -26,25 +29,24 @@ def user_to_response(user: User) -> UserResponse:
         updatedAt=user.updated_at.isoformat()
     )
 
-def get_all_users(db: Session) -> List[UserResponse]:
-    users = get_users(db)
-    return [
-        UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            firstName=user.first_name,
-            lastName=user.last_name,
-            profileImageUrl=user.profile_image_url,
-            role=user.role,
-            isActive=user.is_active,
-            lastLoginAt=user.last_login_at.isoformat() if user.last_login_at else None,
-            createdAt=user.created_at.isoformat(),
-            updatedAt=user.updated_at.isoformat(),
-            userLanguages=get_user_languages(db, user.id)
-        )
-        for user in users
-    ]
+USER_FIELDSET = Fieldset(User, UserResponse, computed={
+    "userLanguages": ((), lambda user: user_languages_to_dicts(user.user_languages)),
+})
+
+def get_all_users(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None
+) -> Tuple[bytes, Optional[str]]:
+    """One page of users with their languages as JSON, and the cursor of the next page"""
+    after = decode_cursor(cursor, (str,))[0] if cursor else None
+    limit = limit or settings.USER_PAGE_SIZE
+    users = get_users(db, search, role, is_active, after, limit)
+    next_page = next_cursor(users, limit, lambda user: (user.username,))
+    return USER_FIELDSET.dumps(users), next_page
 
 def create_user_service(db: Session, user_data: UserCreate) -> UserResponse:
     if get_user_by_username(db, user_data.username):
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare read_audio_header against mutagen on large audio files.
+
+Usage:
+    python benchmarks/bench_audio_headers.py [file ...]
+
+Without arguments a two-hour 44.1kHz stereo WAV is generated as a sparse file
+(only the header is written), which is the worst case for readers that walk
+the whole file.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mutagen import File as MutagenFile
+from app.audio.headers import read_audio_header
+
+
+def make_sparse_wav(path, seconds=2 * 60 * 60, sample_rate=44100, channels=2):
+    block_align = channels * 2
+    data_size = seconds * sample_rate * block_align
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate,
+                                      sample_rate * block_align, block_align, 16))
+        f.write(b"data" + struct.pack("<I", data_size))
+        f.truncate(44 + data_size)
+
+
+def time_call(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - started) / iterations, result
+
+
+def main():
+    paths = sys.argv[1:]
+    temp_dir = None
+    if not paths:
+        temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(temp_dir.name, "two_hours.wav")
+        make_sparse_wav(path)
+        paths = [path]
+
+    iterations = 20
+    for path in paths:
+        header_time, header = time_call(lambda: read_audio_header(path), iterations)
+
+        def mutagen_probe():
+            audio_file = MutagenFile(path)
+            return audio_file.info.length if audio_file is not None else None
+
+        mutagen_time, mutagen_length = time_call(mutagen_probe, iterations)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"{os.path.basename(path)} ({size_mb:.0f} MB)")
+        print(f"  header parser: {header_time * 1000:8.3f} ms  duration={header['duration'] if header else None}")
+        print(f"  mutagen:       {mutagen_time * 1000:8.3f} ms  duration={mutagen_length}")
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
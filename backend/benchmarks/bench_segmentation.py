@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure how fast split_recording segments long recordings.
+
+Usage:
+    python benchmarks/bench_segmentation.py [hours]
+
+A synthetic 16-bit 44.1kHz mono WAV of speech-like bursts separated by short
+pauses is written to a temporary directory and segmented from disk, so the
+timing includes reading and decoding the file block by block.
+"""
+
+import os
+import resource
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.audio.segmentation import split_recording
+
+
+def write_speech_like_wav(path, seconds, sample_rate=44100):
+    rng = np.random.default_rng(0)
+    total_samples = int(seconds * sample_rate)
+    with open(path, "wb") as f:
+        data_size = total_samples * 2
+        f.write(b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16))
+        f.write(b"data" + struct.pack("<I", data_size))
+        written = 0
+        while written < total_samples:
+            burst = int(rng.uniform(3, 12) * sample_rate)
+            pause = int(rng.uniform(0.2, 1.5) * sample_rate)
+            t = np.arange(burst)
+            speech = 8000 * rng.standard_normal(burst) * np.abs(np.sin(t / 2000))
+            silence = 30 * rng.standard_normal(pause)
+            chunk = np.concatenate((speech, silence))[:total_samples - written]
+            f.write(chunk.astype("<i2").tobytes())
+            written += chunk.size
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    seconds = hours * 60 * 60
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "long.wav")
+        write_speech_like_wav(path, seconds)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+
+        started = time.perf_counter()
+        segments = split_recording(path, "long.wav")
+        elapsed = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    lengths = [end - start for start, end, _ in segments]
+    print(f"{hours:g} h recording ({size_mb:.0f} MB)")
+    print(f"  segmented in {elapsed:.2f} s ({seconds / elapsed:.0f}x real time)")
+    print(f"  {len(segments)} segments, {min(lengths):.1f}-{max(lengths):.1f} s long")
+    print(f"  peak RSS {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
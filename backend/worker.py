@@ -0,0 +1,8 @@
+import logging
+from app.main import create_tables
+from app.services.ingestion_service import run_worker
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    create_tables()
+    run_worker()
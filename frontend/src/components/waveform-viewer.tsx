@@ -1,4 +1,5 @@
 import { useRef, useEffect, useState } from "react";
+import { useQuery } from "@tanstack/react-query";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 import { Plus, Minus, ZoomIn, RotateCcw } from "lucide-react";
@@ -9,8 +10,19 @@ interface CutPoint {
   position: number; // percentage 0-100
 }
 
+interface WaveformPeaks {
+  samplesPerPixel: number;
+  zoom: number;
+  zoomLevels: number;
+  start: number;
+  end: number;
+  length: number;
+  data: number[]; // interleaved min/max pairs in -128..127
+}
+
 interface WaveformViewerProps {
   duration: number;
+  segmentId?: number;
   segments?: Array<{
     id: number;
     startTime: number;
@@ -26,6 +38,7 @@ interface WaveformViewerProps {
 
 export function WaveformViewer({ 
   duration, 
+  segmentId,
   segments = [], 
   currentTime = 0,
   onCutPointAdd,
@@ -91,12 +104,27 @@ export function WaveformViewer({
     return points;
   }, [] as CutPoint[]);
 
-  // Generate mock waveform data
-  const waveformBars = Array.from({ length: 100 }, (_, i) => ({
-    id: i,
-    height: Math.random() * 60 + 10,
-    position: i
-  }));
+  // Each zoom step in the UI is 1.5x; the server clamps to the levels it has
+  const peaksZoom = Math.max(0, Math.round(Math.log(zoom) / Math.log(1.5)));
+  const { data: peaks } = useQuery<WaveformPeaks>({
+    queryKey: [`/api/v1/segments/${segmentId}/peaks?zoom=${peaksZoom}`],
+    enabled: !!segmentId,
+    staleTime: Infinity,
+  });
+
+  // Precomputed min/max peaks when available; a flat line while they load or
+  // when the segment has none, and placeholder bars only without a segment
+  const waveformBars = peaks && peaks.length > 0
+    ? Array.from({ length: peaks.length }, (_, i) => ({
+        id: i,
+        height: Math.max(2, ((peaks.data[i * 2 + 1] - peaks.data[i * 2]) / 255) * 80),
+        position: (i / peaks.length) * 100
+      }))
+    : Array.from({ length: 100 }, (_, i) => ({
+        id: i,
+        height: segmentId ? 2 : Math.random() * 60 + 10,
+        position: i
+      }));
 
   return (
     <Card className={className}>
@@ -130,15 +158,17 @@ export function WaveformViewer({
             </Button>
           </div>
           
-          <div className="text-sm text-gray-500">
-            Clique para adicionar pontos de corte • Arraste para mover
-          </div>
+          {onCutPointAdd && (
+            <div className="text-sm text-gray-500">
+              Clique para adicionar pontos de corte • Arraste para mover
+            </div>
+          )}
         </div>
 
         {/* Waveform Container */}
         <div 
           ref={containerRef}
-          className="waveform-container relative cursor-crosshair"
+          className={`waveform-container relative ${onCutPointAdd ? 'cursor-crosshair' : ''}`}
           onClick={handleContainerClick}
           style={{ transform: `scaleX(${zoom})`, transformOrigin: 'left' }}
         >
@@ -157,7 +187,7 @@ export function WaveformViewer({
           {/* Current Position Indicator */}
           <div
             className="absolute top-0 bottom-0 w-0.5 bg-orange-500 z-10 pointer-events-none"
-            style={{ left: `${(currentTime / duration) * 100}%` }}
+            style={{ left: `${duration > 0 ? Math.min(100, (currentTime / duration) * 100) : 0}%` }}
           />
           
           {/* Cut Points */}
@@ -192,17 +222,19 @@ export function WaveformViewer({
         {/* Timeline */}
         <div className="flex items-center justify-between text-sm text-gray-500 mt-4">
           <span>00:00</span>
-          <div className="flex items-center space-x-4">
-            <Button 
-              variant="ghost" 
-              size="sm" 
-              className="text-primary"
-              onClick={() => onCutPointAdd?.(currentTime)}
-            >
-              <Plus className="w-4 h-4 mr-1" />
-              Adicionar Corte
-            </Button>
-          </div>
+          {onCutPointAdd && (
+            <div className="flex items-center space-x-4">
+              <Button 
+                variant="ghost" 
+                size="sm" 
+                className="text-primary"
+                onClick={() => onCutPointAdd(currentTime)}
+              >
+                <Plus className="w-4 h-4 mr-1" />
+                Adicionar Corte
+              </Button>
+            </div>
+          )}
           <span>{formatTime(duration)}</span>
         </div>
 
@@ -11,6 +11,15 @@ interface AuthContextType {
 
 const AuthContext = createContext<AuthContextType | undefined>(undefined);
 
+// A 503 means the server is busy hashing other logins; it says when to come back
+const MAX_LOGIN_ATTEMPTS = 5;
+
+const retryDelayMs = (response: Response): number => {
+  const seconds = Number(response.headers.get("Retry-After"));
+  // Jitter keeps clients that were turned away together from returning together
+  return (Number.isFinite(seconds) && seconds > 0 ? seconds : 1) * 1000 + Math.random() * 1000;
+};
+
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<User | null>(null);
   const [loading, setLoading] = useState(true);
@@ -50,13 +59,21 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const login = async (username: string, password: string): Promise<boolean> => {
     try {
-      const response = await fetch(`${API_BASE_URL}/api/v1/auth/login`, {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({ username, password }),
-      });
+      const attemptLogin = () =>
+        fetch(`${API_BASE_URL}/api/v1/auth/login`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ username, password }),
+        });
+
+      let response = await attemptLogin();
+      for (let attempt = 1; response.status === 503 && attempt < MAX_LOGIN_ATTEMPTS; attempt++) {
+        const delay = retryDelayMs(response);
+        await new Promise((resolve) => setTimeout(resolve, delay));
+        response = await attemptLogin();
+      }
 
       const data = await response.json();
 
@@ -66,7 +83,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         setUser(data.user);
         return true;
       } else {
-        throw new Error(data.message || "Login failed");
+        throw new Error(data.detail || data.message || "Login failed");
       }
     } catch (error) {
       console.error("Login error:", error);
@@ -4,6 +4,7 @@ import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useLanguage } from "@/lib/i18n";
 import { apiRequest } from "@/lib/queryClient";
 import { authenticatedFetch } from "@/lib/api";
+import { API_BASE_URL } from "@/constants";
 import { useToast } from "@/hooks/use-toast";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
@@ -11,6 +12,7 @@ import { Textarea } from "@/components/ui/textarea";
 import { Badge } from "@/components/ui/badge";
 import { Progress } from "@/components/ui/progress";
 import AdvancedAudioPlayer from "@/components/AdvancedAudioPlayer";
+import { WaveformViewer } from "@/components/waveform-viewer";
 import GenreSelectionModal from "@/components/GenreSelectionModal";
 import { getGenreDisplayName, getGenreBadgeStyle } from "@/utils/genreUtils";
 import {
@@ -99,7 +101,13 @@ export default function TranscribeSegmentPage() {
 
   // Load audio as blob
   useEffect(() => {
-    if (!segmentIdNum) return;
+    if (!segmentIdNum || !segment) return;
+
+    // Signed links need no token, so the player streams them with Range requests
+    if (segment.fileUrl?.startsWith('/api/v1/audio/')) {
+      setAudioBlobUrl(`${API_BASE_URL}${segment.fileUrl}`);
+      return;
+    }
 
     let blobUrl: string | null = null;
 
@@ -125,7 +133,7 @@ export default function TranscribeSegmentPage() {
         URL.revokeObjectURL(blobUrl);
       }
     };
-  }, [segmentIdNum]);
+  }, [segmentIdNum, segment?.id, segment?.fileUrl]);
 
 
 
@@ -460,6 +468,14 @@ export default function TranscribeSegmentPage() {
               className="mb-6"
             />
 
+            {/* Waveform from the segment's precomputed peaks */}
+            <WaveformViewer
+              duration={duration || segment.duration}
+              segmentId={segment.id}
+              currentTime={currentTime}
+              className="mb-6"
+            />
+
             {/* Transcription and Translation Area */}
             <Card>
               <CardHeader>